@@ -0,0 +1,125 @@
+"""Dashboard latency: sync view vs async view, with and without concurrent queries.
+
+SQLite answers in microseconds, so every query is delayed by ``--latency`` ms to stand in
+for a database across the network (the delay sleeps, like a socket wait would):
+
+    python benchmarks/async_dashboard.py [--latency 5] [--requests 200]
+
+The summary cache is cleared before every request so each one runs the full query set.
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from common import setup_django
+
+
+def add_latency(seconds):
+    from django.db.backends.signals import connection_created
+
+    def delay(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        if delay not in connection.execute_wrappers:
+            connection.execute_wrappers.append(delay)
+
+    # Worker-thread connections are opened later, so hook every new (or reopened) connection.
+    connection_created.connect(install, weak=False)
+
+
+def seed():
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+
+    from finance.models import BudgetLimit, Category, PurchaseGoal, Transaction
+
+    user = User.objects.create_user("bench")
+    folders = [Category.objects.create(user=user, name=f"Folder {i}") for i in range(5)]
+    BudgetLimit.objects.create(user=user, weekly_limit=Decimal("500"), monthly_limit=Decimal("2000"))
+    now = timezone.now()
+    for i in range(2000):
+        Transaction.objects.create(
+            user=user,
+            folder=folders[i % len(folders)],
+            amount=Decimal((i % 90) - 60),
+            description=f"Merchant {i % 40}",
+            date=now - timedelta(hours=i),
+        )
+    for i in range(4):
+        PurchaseGoal.objects.create(
+            user=user, description=f"Goal {i}", target_amount=Decimal("1000"),
+            current_saved=Decimal(100 * i), deadline=now.date() + timedelta(days=30 * i),
+        )
+    return user
+
+
+def report(label, timings):
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{label:<28} p50 {statistics.median(ordered):7.2f} ms   p99 {p99:7.2f} ms")
+    return statistics.median(ordered)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=5.0, help="Added per query, in ms.")
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    database = Path(tempfile.mkdtemp(prefix="cadee-bench-")) / "bench.sqlite3"
+    setup_django(database=str(database))
+    user = seed()
+
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test import AsyncRequestFactory, RequestFactory
+    from django.test.utils import override_settings
+
+    from finance import views
+
+    connection.close()
+    add_latency(args.latency / 1000)
+
+    def sync_timings():
+        timings = []
+        for _ in range(args.requests):
+            cache.clear()
+            request = RequestFactory().get("/")
+            request.user = user
+            started = time.perf_counter()
+            views.dashboard(request)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    async def async_timings():
+        async def auser():
+            return user
+
+        timings = []
+        for _ in range(args.requests):
+            await cache.aclear()
+            request = AsyncRequestFactory().get("/")
+            request.auser = auser
+            started = time.perf_counter()
+            await views.adashboard(request)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    print(f"{args.requests} dashboard requests, {args.latency:g} ms added per query\n")
+    baseline = report("sync view", sync_timings())
+    with override_settings(FINANCE_ASYNC_CONCURRENT_QUERIES=False):
+        report("async, one query at a time", asyncio.run(async_timings()))
+    with override_settings(FINANCE_ASYNC_CONCURRENT_QUERIES=True):
+        concurrent = report("async, concurrent queries", asyncio.run(async_timings()))
+    print(f"\np50 speed-up of the concurrent async view: {baseline / concurrent:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
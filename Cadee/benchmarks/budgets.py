@@ -0,0 +1,86 @@
+"""Nightly budget evaluation over many users.
+
+Bulk-writes ``--users`` users with limits and ``--days`` of daily rollups each (three in
+four of them over or near a limit) into a throwaway SQLite database, then times
+``evaluate_budgets`` twice (the first run raises every alert, the second finds them
+unchanged) and reports the peak memory of a third, traced run:
+
+    python benchmarks/budgets.py [--users 100000] [--days 14] [--chunk-size 2000]
+"""
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from common import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=14, help="Rollup days per user, ending today.")
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    database = Path(tempfile.mkdtemp(prefix="cadee-bench-")) / "budgets.sqlite3"
+    setup_django(database=str(database))
+
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from finance.budgets import evaluate_budgets
+    from finance.models import BudgetLimit, Category, DailyRollup
+
+    User = get_user_model()
+    rng = random.Random(args.seed)
+    today = timezone.localdate()
+    started = time.perf_counter()
+    users = User.objects.bulk_create(
+        [User(username=f"budget{index:06d}") for index in range(args.users)], batch_size=5000
+    )
+    BudgetLimit.objects.bulk_create(
+        [BudgetLimit(user=user, weekly_limit=Decimal("700.00"), monthly_limit=Decimal("3000.00"))
+         for user in users],
+        batch_size=5000,
+    )
+    folders = Category.objects.bulk_create(
+        [Category(user=user, name="Daily") for user in users], batch_size=5000
+    )
+    rollups = []
+    for folder in folders:
+        daily = Decimal(rng.choice((40, 80, 95, 120)))
+        for offset in range(args.days):
+            rollups.append(DailyRollup(
+                user_id=folder.user_id, folder=folder, day=today - timedelta(days=offset),
+                expenses=daily, transaction_count=1,
+            ))
+        if len(rollups) >= 50000:
+            DailyRollup.objects.bulk_create(rollups)
+            rollups = []
+    DailyRollup.objects.bulk_create(rollups)
+    print(f"Wrote {args.users:,} users x {args.days} rollup days in {time.perf_counter() - started:.1f}s\n")
+
+    print(f"{'run':<8}{'chunks':>8}{'alerts':>9}{'written':>9}{'seconds':>9}")
+    for run in ("first", "repeat"):
+        started = time.perf_counter()
+        results = list(evaluate_budgets(chunk_size=args.chunk_size))
+        elapsed = time.perf_counter() - started
+        alerts = sum(result.alerts for result in results)
+        written = sum(result.created + result.updated + result.cleared for result in results)
+        print(f"{run:<8}{len(results):>8}{alerts:>9,}{written:>9,}{elapsed:>9.2f}")
+
+    # Traced separately: tracemalloc slows the timed runs several times over.
+    tracemalloc.start()
+    for _ in evaluate_budgets(chunk_size=args.chunk_size):
+        pass
+    print(f"\nPeak traced memory of a run: {tracemalloc.get_traced_memory()[1] / 1024:,.0f} KiB")
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Time a serverless cold start: process start to the first successful ``/login/`` response.
+
+Each run is a fresh interpreter that imports ``api/index.py`` (what Vercel does on a
+cold start) and sends it one WSGI request, for each settings profile:
+
+    python benchmarks/cold_start.py [--runs 10] [--settings cadee_core.settings ...]
+    python benchmarks/cold_start.py --importtime 25   # where the import time goes
+    python benchmarks/cold_start.py --json cold_start.json  # keep results to compare over time
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+PROFILES = ("cadee_core.settings", "cadee_core.settings_serverless")
+HOST = "cadee.vercel.app"
+
+
+def child():
+    """Runs inside the measured process; prints one JSON line once /login/ answered."""
+    from io import BytesIO
+
+    started = time.perf_counter()
+    sys.path.insert(0, str(REPO_ROOT))
+    from api.index import application
+
+    booted = time.perf_counter()
+    status = []
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": "/login/",
+        "QUERY_STRING": "",
+        "SERVER_NAME": HOST,
+        "SERVER_PORT": "443",
+        "HTTP_HOST": HOST,
+        "wsgi.url_scheme": "https",
+        "wsgi.input": BytesIO(),
+        "wsgi.errors": sys.stderr,
+    }
+    body = b"".join(application(environ, lambda code, headers: status.append(code)))
+    answered = time.perf_counter()
+    print(
+        json.dumps(
+            {
+                "status": status[0],
+                "bytes": len(body),
+                "boot_ms": (booted - started) * 1000,
+                "first_request_ms": (answered - booted) * 1000,
+                "modules": len(sys.modules),
+            }
+        ),
+        flush=True,
+    )
+
+
+def cold_start(settings_module, importtime=False):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += [__file__, "--child"]
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        command, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    line = process.stdout.readline()
+    elapsed = (time.perf_counter() - started) * 1000
+    _, stderr = process.communicate()
+    if not line:
+        raise SystemExit(f"{settings_module} did not answer:\n{stderr}")
+    result = json.loads(line)
+    if not result["status"].startswith("200"):
+        raise SystemExit(f"{settings_module} answered {result['status']} on /login/")
+    result["total_ms"] = elapsed
+    return result, stderr
+
+
+def import_report(stderr, limit):
+    """Top modules by cumulative import time, plus self time summed per top-level package."""
+    modules = []
+    packages = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        modules.append((int(cumulative_us), int(self_us), depth, name))
+        packages[name.split(".")[0]] += int(self_us)
+
+    print("  slowest imports (cumulative ms, self ms):")
+    for cumulative_us, self_us, depth, name in sorted(modules, reverse=True)[:limit]:
+        print(f"    {cumulative_us / 1000:8.1f} {self_us / 1000:8.1f}  {'  ' * depth}{name}")
+    print("  self time by top-level package (ms):")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:limit]:
+        print(f"    {self_us / 1000:8.1f}  {package}")
+
+
+def summarize(runs):
+    totals = [run["total_ms"] for run in runs]
+    return {
+        "runs": len(runs),
+        "total_ms_median": statistics.median(totals),
+        "total_ms_min": min(totals),
+        "total_ms_max": max(totals),
+        "boot_ms_median": statistics.median(run["boot_ms"] for run in runs),
+        "first_request_ms_median": statistics.median(run["first_request_ms"] for run in runs),
+        "modules": runs[-1]["modules"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--settings", nargs="+", default=PROFILES)
+    parser.add_argument("--importtime", type=int, metavar="N", default=0,
+                        help="Also print the N slowest imports per profile (python -X importtime).")
+    parser.add_argument("--json", metavar="PATH", help="Append the summary to this JSON file.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    results = {}
+    for settings_module in args.settings:
+        cold_start(settings_module)  # warm the OS page cache and .pyc files once
+        runs = [cold_start(settings_module)[0] for _ in range(args.runs)]
+        summary = results[settings_module] = summarize(runs)
+        print(
+            f"{settings_module}: {summary['total_ms_median']:.0f} ms median to first /login/ "
+            f"(min {summary['total_ms_min']:.0f}, max {summary['total_ms_max']:.0f}); "
+            f"boot {summary['boot_ms_median']:.0f} ms, first request "
+            f"{summary['first_request_ms_median']:.0f} ms, {summary['modules']} modules"
+        )
+        if args.importtime:
+            import_report(cold_start(settings_module, importtime=True)[1], args.importtime)
+
+    if args.json:
+        path = Path(args.json)
+        history = json.loads(path.read_text()) if path.exists() else []
+        history.append(
+            {"recorded_at": datetime.now(timezone.utc).isoformat(), "python": sys.version.split()[0],
+             "results": results}
+        )
+        path.write_text(json.dumps(history, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Shared setup for the scripts in this folder.
+
+Run them from the ``Cadee/`` directory, e.g. ``python benchmarks/transaction_rows.py``.
+"""
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup_django(database=":memory:", migrate=True):
+    """Configure Django against a throwaway SQLite database and apply migrations."""
+    sys.path.insert(0, str(PROJECT_ROOT))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cadee_core.settings")
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES["default"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": database}
+    django.setup()
+
+    if migrate:
+        from django.core.management import call_command
+
+        call_command("migrate", verbosity=0)
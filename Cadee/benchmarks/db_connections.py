@@ -0,0 +1,93 @@
+"""Per-request connection latency under each DB_CONNECTION_MODE (see cadee_core/database.py).
+
+Needs a real Postgres; SQLite has no handshake to measure. Point the usual variables at it:
+
+    POSTGRES_URL_NON_POOLING=postgres://... [POSTGRES_URL=postgres://...pgbouncer...] \\
+        python benchmarks/db_connections.py [--requests 200] [--modes per-request persistent pool]
+
+Every mode runs in its own process, because DATABASES is fixed once Django is set up.
+A "request" is request_started -> one small query -> request_finished, which is where
+Django opens, health-checks, returns to the pool or closes connections.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from common import PROJECT_ROOT
+
+MODES = ("per-request", "persistent", "pooler", "pool")
+
+
+def child(requests):
+    sys.path.insert(0, str(PROJECT_ROOT))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cadee_core.settings")
+    import django
+
+    django.setup()
+    from django.core import signals
+    from django.db import connection
+
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        signals.request_started.send(sender=None)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        signals.request_finished.send(sender=None)
+        timings.append((time.perf_counter() - started) * 1000)
+    connection.close()
+    print(json.dumps({"vendor": connection.vendor, "timings": timings}))
+
+
+def run_mode(mode, requests):
+    env = dict(os.environ, DB_CONNECTION_MODE=mode)
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child", "--requests", str(requests)],
+        env=env, capture_output=True, text=True,
+    )
+    if completed.returncode:
+        return None, completed.stderr.strip().splitlines()[-1]
+    return json.loads(completed.stdout), None
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect latency per DB_CONNECTION_MODE.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.requests)
+        return
+
+    print(f"{'mode':<12} {'first ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for mode in args.modes:
+        if mode == "pooler" and not os.environ.get("POSTGRES_URL"):
+            print(f"{mode:<12} skipped: set POSTGRES_URL to the pooled (PgBouncer) URL")
+            continue
+        result, error = run_mode(mode, args.requests)
+        if error:
+            print(f"{mode:<12} skipped: {error}")
+            continue
+        if result["vendor"] != "postgresql":
+            raise SystemExit("No Postgres URL in the environment; see the module docstring.")
+        first, *rest = result["timings"]
+        print(
+            f"{mode:<12} {first:9.2f} {statistics.median(rest):8.2f} "
+            f"{percentile(rest, 0.95):8.2f} {max(rest):8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
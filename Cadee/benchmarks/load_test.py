@@ -0,0 +1,308 @@
+"""Load test: concurrent simulated users against the WSGI app, with per-endpoint percentiles.
+
+Each virtual user logs in, then loops until ``--duration`` runs out: dashboard, the add
+form, a new transaction, the history and ``--pages`` "Load more" pages. Every request is
+timed; the report gives throughput and, per endpoint, p50/p95/p99 latency and the error
+rate (any status >= 400 or a failed connection).
+
+In process (default), against a fresh SQLite database seeded with ``seed_finance``.
+Requests call ``cadee_core.wsgi.application`` directly from one thread per user, so
+there is no socket or server in the way:
+
+    python benchmarks/load_test.py [--users 10] [--duration 20] [--think 0]
+
+Against a running server, e.g. ``gunicorn cadee_core.wsgi -w 4`` on a database seeded
+with ``manage.py seed_finance --prefix load --password load-test``:
+
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 [--users 50]
+
+Logins go through the configured password hasher, so they are meant to be slow.
+"""
+import argparse
+import http.client
+import io
+import json
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from http.cookies import SimpleCookie
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+from common import setup_django
+
+PASSWORD = "load-test"
+PREFIX = "load"
+FOLDER_OPTION = re.compile(rb'<option value="(\d+)"')
+NEXT_PAGE = re.compile(rb'data-fragment-url="[^"?]*\?cursor=([^"&]+)')
+
+
+#Transports
+class InProcess:
+    """Calls the WSGI application directly."""
+
+    def __init__(self, application):
+        self.application = application
+
+    def request(self, method, path, headers, body=b""):
+        path, _, query = path.partition("?")
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "HTTP_HOST": "localhost",
+            "REMOTE_ADDR": "127.0.0.1",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in headers.items():
+            key = name.upper().replace("-", "_")
+            environ[key if key == "CONTENT_TYPE" else f"HTTP_{key}"] = value
+
+        started = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            started["status"] = int(status.split(" ", 1)[0])
+            started["headers"] = response_headers
+
+        result = self.application(environ, start_response)
+        try:
+            content = b"".join(result)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        return started["status"], started["headers"], content
+
+    def close(self):
+        pass
+
+
+class OverHttp:
+    """One keep-alive connection per virtual user to a running server."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host = parts.netloc
+        self.connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+
+    def request(self, method, path, headers, body=b""):
+        try:
+            self.connection.request(method, path, body=body or None, headers={"Host": self.host, **headers})
+            response = self.connection.getresponse()
+            return response.status, response.getheaders(), response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            raise
+
+    def close(self):
+        self.connection.close()
+
+
+#Virtual users
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, label, elapsed, ok):
+        with self.lock:
+            self.timings[label].append(elapsed)
+            if not ok:
+                self.errors[label] += 1
+
+
+class VirtualUser:
+    def __init__(self, transport, stats, rng):
+        self.transport = transport
+        self.stats = stats
+        self.rng = rng
+        self.cookies = {}
+
+    def request(self, method, path, data=None, label=None):
+        headers = {}
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{name}={value}" for name, value in self.cookies.items())
+        body = b""
+        if data is not None:
+            body = urlencode({**data, "csrfmiddlewaretoken": self.cookies.get("csrftoken", "")}).encode()
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+        started = time.perf_counter()
+        try:
+            status, response_headers, content = self.transport.request(method, path, headers, body)
+        except (OSError, http.client.HTTPException):
+            status, response_headers, content = 0, [], b""
+        elapsed = (time.perf_counter() - started) * 1000
+        self.stats.record(label or f"{method} {path.partition('?')[0]}", elapsed, 0 < status < 400)
+
+        for name, value in response_headers:
+            if name.lower() == "set-cookie":
+                for morsel in SimpleCookie(value).values():
+                    self.cookies[morsel.key] = morsel.value
+        return status, content
+
+    def log_in(self, username):
+        self.request("GET", "/login/")
+        status, _ = self.request("POST", "/login/", {"username": username, "password": PASSWORD})
+        return status == 302 and "sessionid" in self.cookies
+
+    def visit(self, pages):
+        self.request("GET", "/")
+        status, form = self.request("GET", "/transactions/new/")
+        folders = FOLDER_OPTION.findall(form) if status == 200 else []
+        self.request(
+            "POST",
+            "/transactions/new/",
+            {
+                "folder": self.rng.choice(folders).decode() if folders else "",
+                "description": self.rng.choice(("Coffee", "Groceries", "Bus fare", "Lunch")),
+                "amount": f"-{self.rng.uniform(50, 900):.2f}",
+                "date": datetime.now().strftime("%Y-%m-%dT%H:%M"),
+            },
+        )
+        _, page = self.request("GET", "/transactions/")
+        for _ in range(pages):
+            cursor = NEXT_PAGE.search(page)
+            if not cursor:
+                break
+            _, page = self.request("GET", f"/transactions/more/?cursor={cursor.group(1).decode()}")
+
+
+def run_user(number, make_transport, stats, args, deadline, start_at):
+    time.sleep(max(0, start_at - time.monotonic()))
+    transport = make_transport()
+    user = VirtualUser(transport, stats, random.Random(number))
+    try:
+        if not user.log_in(f"{args.prefix}{number % args.accounts + 1:05d}"):
+            return
+        while time.monotonic() < deadline:
+            user.visit(args.pages)
+            if args.think:
+                time.sleep(user.rng.expovariate(1000 / args.think))
+    finally:
+        transport.close()
+
+
+#Report
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(stats, elapsed):
+    endpoints = {}
+    for label, timings in sorted(stats.timings.items()):
+        ordered = sorted(timings)
+        endpoints[label] = {
+            "requests": len(ordered),
+            "errors": stats.errors[label],
+            "error_rate": round(stats.errors[label] / len(ordered), 4),
+            "p50_ms": round(percentile(ordered, 0.50), 2),
+            "p95_ms": round(percentile(ordered, 0.95), 2),
+            "p99_ms": round(percentile(ordered, 0.99), 2),
+            "max_ms": round(ordered[-1], 2),
+        }
+    total = sum(row["requests"] for row in endpoints.values())
+    errors = sum(row["errors"] for row in endpoints.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0,
+        "error_rate": round(errors / total, 4) if total else 0,
+        "endpoints": endpoints,
+    }
+
+
+def report(summary, args):
+    print(
+        f"\n{args.users} users for {summary['elapsed_s']}s: {summary['requests']} requests, "
+        f"{summary['throughput_rps']} req/s, {summary['error_rate']:.2%} errors\n"
+    )
+    print(f"{'endpoint':<28}{'count':>7}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+    for label, row in summary["endpoints"].items():
+        print(
+            f"{label:<28}{row['requests']:>7}{row['error_rate']:>7.1%}{row['p50_ms']:>9.1f}"
+            f"{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}"
+        )
+
+
+def in_process_transport(args):
+    database = Path(tempfile.mkdtemp(prefix="cadee-load-")) / "load.sqlite3"
+    setup_django(database=str(database))
+
+    from django.conf import settings
+
+    from finance.seeding import seed_finance
+
+    print(f"Seeding {args.accounts} users x {args.transactions} transactions...")
+    seed_finance(
+        users=args.accounts, transactions=args.transactions, prefix=args.prefix,
+        password=PASSWORD, until=date.today(),
+    )
+    # Production-like: no SQL log kept per request, and the in-process host is allowed.
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ["localhost"]
+
+    from cadee_core.wsgi import application
+
+    return lambda: InProcess(application)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="A running server; omit to drive the app in process.")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users.")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds of load after ramp-up starts.")
+    parser.add_argument("--ramp-up", type=float, default=2, help="Seconds over which users start.")
+    parser.add_argument("--think", type=float, default=0, help="Mean pause between visits, in ms.")
+    parser.add_argument("--pages", type=int, default=2, help="'Load more' pages per visit.")
+    parser.add_argument("--accounts", type=int, help="Seeded accounts to log in as (default: --users).")
+    parser.add_argument("--transactions", type=int, default=2000, help="Per seeded account (in process).")
+    parser.add_argument("--prefix", default=PREFIX, help="Username prefix of the seeded accounts.")
+    parser.add_argument("--json", type=Path, help="Also write the summary here.")
+    args = parser.parse_args()
+    args.accounts = args.accounts or args.users
+
+    if args.url:
+        make_transport = lambda: OverHttp(args.url)  # noqa: E731
+    else:
+        make_transport = in_process_transport(args)
+
+    stats = Stats()
+    started = time.monotonic()
+    deadline = started + args.duration
+    threads = [
+        threading.Thread(
+            target=run_user,
+            args=(number, make_transport, stats, args, deadline,
+                  started + args.ramp_up * number / args.users),
+        )
+        for number in range(args.users)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    summary = summarize(stats, time.monotonic() - started)
+    report(summary, args)
+    if args.json:
+        args.json.write_text(json.dumps({"settings": vars(args), **summary}, indent=2, default=str) + "\n")
+
+
+if __name__ == "__main__":
+    main()
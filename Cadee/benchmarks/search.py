@@ -0,0 +1,53 @@
+"""Transaction search latency at scale (FTS5 on SQLite, or tsvector/GIN on PostgreSQL).
+
+Seeds ``--users`` x ``--transactions`` rows with ``seed_finance`` into a throwaway SQLite
+database, then times ``search_transactions`` for common, rare and multi-word prefixes:
+
+    python benchmarks/search.py [--users 100] [--transactions 10000] [--repeat 20]
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from common import setup_django
+
+QUERIES = ("grab", "gr", "coffee pro", "netflix", "ramen nagi", "zzz")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--transactions", type=int, default=10000, help="Per user.")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    database = Path(tempfile.mkdtemp(prefix="cadee-bench-")) / "search.sqlite3"
+    setup_django(database=str(database))
+
+    from django.contrib.auth import get_user_model
+
+    from finance.search import search_transactions
+    from finance.seeding import seed_finance
+
+    result = seed_finance(
+        users=args.users, transactions=args.transactions, until=date(2026, 6, 30)
+    )
+    print(f"Seeded {result.transactions:,} transactions in {result.elapsed:.1f}s\n")
+
+    users = list(get_user_model().objects.order_by("pk")[:args.repeat])
+    print(f"{'query':<14}{'matches':>9}{'p50 ms':>9}{'max ms':>9}")
+    for text in QUERIES:
+        timings = []
+        for index in range(args.repeat):
+            user = users[index % len(users)]
+            started = time.perf_counter()
+            rows = search_transactions(user, text)
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f"{text:<14}{len(rows):>9}{statistics.median(timings):>9.2f}{max(timings):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Compare the old model-instance row path with the values() projection + money filter.
+
+    python benchmarks/transaction_rows.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from common import setup_django
+
+LEGACY_TEMPLATE = """{% load humanize %}{% for txn in transactions %}
+<li><p>{{ txn.description }}</p><p>{{ txn.date|date:"M d, Y" }}{% if txn.folder %} · {{ txn.folder.name }}{% endif %}</p>
+<span class="amount {% if txn.is_negative %}neg{% else %}pos{% endif %}">{% if txn.is_negative %}-{{ currency_symbol }} {{ txn.amount_display|floatformat:2|intcomma }}{% else %}{{ currency_symbol }} {{ txn.amount_display|floatformat:2|intcomma }}{% endif %}</span></li>
+{% endfor %}"""
+
+PROJECTED_TEMPLATE = """{% load finance_tags %}{% for txn in transactions %}
+<li><p>{{ txn.description }}</p><p>{{ txn.date|date:"M d, Y" }}{% if txn.folder_name %} · {{ txn.folder_name }}{% endif %}</p>
+<span class="amount {% if txn.amount < 0 %}neg{% else %}pos{% endif %}">{{ txn.amount|money:currency_symbol }}</span></li>
+{% endfor %}"""
+
+
+def legacy_rows(queryset):
+    # The pre-projection path: full instances + related Category, then a dict per row.
+    items = []
+    for txn in queryset.select_related("folder"):
+        amount = txn.amount or Decimal("0.00")
+        items.append(
+            {
+                "description": txn.description,
+                "date": txn.date,
+                "folder": txn.folder,
+                "amount": amount,
+                "amount_display": abs(amount),
+                "is_negative": amount < 0,
+            }
+        )
+    return items
+
+
+def seed(row_count):
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+
+    from finance.models import Category, Transaction
+
+    user = User.objects.create_user("bench")
+    folders = [Category.objects.create(user=user, name=f"Folder {i}") for i in range(8)]
+    now = timezone.now()
+    Transaction.objects.bulk_create(
+        (
+            Transaction(
+                user=user,
+                folder=folders[i % len(folders)],
+                amount=Decimal(((i * 7919) % 200000) - 100000) / 100,
+                description=f"Merchant {i % 500}",
+                date=now - timedelta(minutes=i * 17),
+            )
+            for i in range(row_count)
+        ),
+        batch_size=2000,
+    )
+    return user
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.template import engines
+
+    from finance.models import Transaction
+    from finance.services import project_transaction_rows
+
+    user = seed(args.rows)
+    queryset = Transaction.objects.filter(user=user).order_by("-date", "-id")
+    engine = engines["django"]
+    legacy_template = engine.from_string(LEGACY_TEMPLATE)
+    projected_template = engine.from_string(PROJECTED_TEMPLATE)
+
+    def legacy():
+        legacy_template.render({"transactions": legacy_rows(queryset), "currency_symbol": "₱"})
+
+    def projected():
+        rows = list(project_transaction_rows(queryset))
+        projected_template.render({"transactions": rows, "currency_symbol": "₱"})
+
+    results = {
+        "fetch legacy": best_of(args.repeat, lambda: legacy_rows(queryset)),
+        "fetch projected": best_of(args.repeat, lambda: list(project_transaction_rows(queryset))),
+        "fetch + render legacy": best_of(args.repeat, legacy),
+        "fetch + render projected": best_of(args.repeat, projected),
+    }
+    print(f"{args.rows} rows, best of {args.repeat}")
+    for name, seconds in results.items():
+        print(f"  {name:<26} {seconds * 1000:9.1f} ms")
+    speedup = results["fetch + render legacy"] / results["fetch + render projected"]
+    print(f"  end-to-end speedup         {speedup:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Wall time, query count and peak memory of every view in ``cadee_core/urls.py``.
+
+Each data size gets a fresh database seeded with ``seed_finance`` (``USERSxTRANSACTIONS``
+per user); the views are requested as the first seeded user with the cache cleared
+before every request. Results go to a JSON file keyed by size and URL name, so two
+commits can be compared:
+
+    python benchmarks/views.py [--sizes 10x200,50x2000] [--repeat 7] [--output PATH]
+    python benchmarks/views.py --compare benchmarks/results/views-<sha>.json
+
+GET only; views that change state on GET (logout) or need a stored file (media) are
+skipped, as is the admin.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timezone as dt_timezone
+from pathlib import Path
+
+from common import PROJECT_ROOT, setup_django
+
+SKIP = {"logout", "media"}
+QUERY_STRINGS = {"api_batch": "?include=summary,goals,transactions"}
+DEFAULT_SIZES = "10x200,20x2000,20x20000"
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def parse_sizes(value):
+    sizes = []
+    for item in value.split(","):
+        users, _, transactions = item.strip().partition("x")
+        sizes.append((int(users), int(transactions)))
+    return sizes
+
+
+def fresh_database(path):
+    from django.core.management import call_command
+    from django.db import connection
+
+    connection.close()
+    connection.settings_dict["NAME"] = str(path)
+    call_command("migrate", verbosity=0)
+
+
+def view_urls(user):
+    """``(name, url)`` for every benchmarked pattern, filling ``goal_id`` from the user's goals."""
+    from django.urls import URLPattern, get_resolver, reverse
+
+    from finance.models import PurchaseGoal
+
+    goal = PurchaseGoal.objects.filter(user=user).order_by("pk").first()
+    values = {"goal_id": goal.pk if goal else None}
+    for pattern in get_resolver().url_patterns:
+        if not isinstance(pattern, URLPattern) or not pattern.name or pattern.name in SKIP:
+            continue
+        names = pattern.pattern.regex.groupindex
+        if any(values.get(name) is None for name in names):
+            continue
+        url = reverse(pattern.name, kwargs={name: values[name] for name in names})
+        yield pattern.name, url + QUERY_STRINGS.get(pattern.name, "")
+
+
+def request(client, url):
+    response = client.get(url)
+    if response.streaming:
+        b"".join(response.streaming_content)
+    return response
+
+
+def measure(client, url, repeat):
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    timings = []
+    for _ in range(repeat):
+        cache.clear()
+        started = time.perf_counter()
+        response = request(client, url)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    # Queries and memory on a separate pass: tracing would skew the timings.
+    cache.clear()
+    tracemalloc.start()
+    with CaptureQueriesContext(connection) as queries:
+        request(client, url)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "status": response.status_code,
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "queries": len(queries),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_size(users, transactions, repeat, workdir):
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.test import Client
+
+    fresh_database(workdir / f"views-{users}x{transactions}.sqlite3")
+    # A fixed end date keeps the data identical between runs on different days.
+    call_command(
+        "seed_finance", users=users, transactions=transactions, until=date(2026, 6, 30),
+        verbosity=0,
+    )
+    user = get_user_model().objects.order_by("pk").first()
+    client = Client()
+    client.force_login(user)
+
+    results = {}
+    for name, url in view_urls(user):
+        results[name] = measure(client, url, repeat)
+        row = results[name]
+        print(
+            f"  {name:<24} {row['status']}  {row['median_ms']:9.2f} ms  "
+            f"{row['queries']:4d} queries  {row['peak_kib']:9.1f} KiB"
+        )
+    return results
+
+
+def compare(current, baseline):
+    print(f"\nvs {baseline.get('commit', '?')} (median ms / queries / peak KiB, new - old)")
+    for size, views in current["sizes"].items():
+        before = baseline.get("sizes", {}).get(size)
+        if not before:
+            print(f"{size}: not in the baseline")
+            continue
+        print(size)
+        for name, row in views.items():
+            old = before.get(name)
+            if not old:
+                print(f"  {name:<24} new")
+                continue
+            change = (row["median_ms"] - old["median_ms"]) / old["median_ms"] * 100 if old["median_ms"] else 0
+            print(
+                f"  {name:<24} {row['median_ms'] - old['median_ms']:+9.2f} ms ({change:+6.1f}%)  "
+                f"{row['queries'] - old['queries']:+4d} queries  "
+                f"{row['peak_kib'] - old['peak_kib']:+9.1f} KiB"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated USERSxTRANSACTIONS.")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed requests per view.")
+    parser.add_argument("--output", type=Path, help="Defaults to benchmarks/results/views-<commit>.json.")
+    parser.add_argument("--compare", type=Path, help="An earlier results file to diff against.")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    workdir = Path(tempfile.mkdtemp(prefix="cadee-bench-"))
+    setup_django(database=str(workdir / "setup.sqlite3"), migrate=False)
+
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()  # Lets the test client's "testserver" host through.
+
+    results = {
+        "commit": commit,
+        "created": datetime.now(dt_timezone.utc).isoformat(timespec="seconds"),
+        "repeat": args.repeat,
+        "sizes": {},
+    }
+    for users, transactions in parse_sizes(args.sizes):
+        print(f"{users} users x {transactions} transactions")
+        results["sizes"][f"{users}x{transactions}"] = run_size(users, transactions, args.repeat, workdir)
+
+    output = args.output or PROJECT_ROOT / "benchmarks" / "results" / f"views-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
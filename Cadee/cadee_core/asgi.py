@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cadee_core.settings')
+# Serve the async dashboard and transaction history (set to 0 to keep the sync views).
+os.environ.setdefault('FINANCE_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
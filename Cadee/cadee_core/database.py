@@ -0,0 +1,95 @@
+"""
+Build ``DATABASES["default"]`` from the environment for the chosen connection mode.
+
+``DB_CONNECTION_MODE`` picks how connections are reused:
+
+- ``pooler``: behind a transaction pooler such as PgBouncer or Vercel's pooled
+  ``POSTGRES_URL``. A pooled backend may change between transactions, so server-side
+  cursors (``QuerySet.iterator()``) and psycopg 3's automatic prepared statements
+  are turned off.
+- ``pool``: an in-process psycopg 3 pool (``pip install "psycopg[binary,pool]"``) on
+  the direct ``POSTGRES_URL_NON_POOLING`` connection; the pool checks a connection
+  before handing it out.
+- ``persistent``: one connection per worker kept for ``DB_CONN_MAX_AGE`` seconds and
+  health-checked before reuse.
+- ``per-request``: connect and disconnect on every request.
+- ``auto`` (default): ``pooler`` when ``POSTGRES_URL`` is set, else ``persistent``.
+
+Without any database URL the local SQLite file is used.
+"""
+import importlib.util
+
+import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
+
+MODES = ("auto", "pooler", "pool", "persistent", "per-request")
+DEFAULT_CONN_MAX_AGE = 600
+
+# Where each mode looks for its URL, first match wins.
+POOLED_URLS = ("POSTGRES_URL", "DATABASE_URL", "POSTGRES_URL_NON_POOLING", "POSTGRES_URL_NO_SSL")
+DIRECT_URLS = ("POSTGRES_URL_NON_POOLING", "DATABASE_URL", "POSTGRES_URL", "POSTGRES_URL_NO_SSL")
+
+
+def _first(environ, names):
+    for name in names:
+        if environ.get(name):
+            return environ[name]
+    return None
+
+
+def _int(environ, name, default):
+    try:
+        return int(environ.get(name, default))
+    except (TypeError, ValueError):
+        raise ImproperlyConfigured(f"{name} must be an integer.") from None
+
+
+def has_psycopg3():
+    return importlib.util.find_spec("psycopg") is not None
+
+
+def connection_mode(environ):
+    mode = environ.get("DB_CONNECTION_MODE", "auto").strip().lower() or "auto"
+    if mode not in MODES:
+        raise ImproperlyConfigured(f"DB_CONNECTION_MODE must be one of {', '.join(MODES)}.")
+    if mode == "auto":
+        return "pooler" if environ.get("POSTGRES_URL") else "persistent"
+    return mode
+
+
+def database_config(environ, sqlite_path):
+    mode = connection_mode(environ)
+    url = _first(environ, POOLED_URLS if mode == "pooler" else DIRECT_URLS)
+    if not url:
+        return {"ENGINE": "django.db.backends.sqlite3", "NAME": sqlite_path}
+
+    max_age = _int(environ, "DB_CONN_MAX_AGE", DEFAULT_CONN_MAX_AGE)
+    if mode in ("pool", "per-request"):
+        # The pool owns reuse (Django rejects CONN_MAX_AGE with it); per-request never reuses.
+        max_age = 0
+    config = dj_database_url.parse(
+        url,
+        conn_max_age=max_age,
+        conn_health_checks=max_age > 0,
+        disable_server_side_cursors=mode == "pooler",
+    )
+    options = config.setdefault("OPTIONS", {})
+
+    if mode == "pooler":
+        if has_psycopg3():
+            options["prepare_threshold"] = None
+    elif mode == "pool":
+        if importlib.util.find_spec("psycopg_pool") is None:
+            raise ImproperlyConfigured(
+                'DB_CONNECTION_MODE=pool needs psycopg 3 with its pool: pip install "psycopg[binary,pool]".'
+            )
+        from psycopg_pool import ConnectionPool
+
+        options["pool"] = {
+            "min_size": _int(environ, "DB_POOL_MIN_SIZE", 1),
+            "max_size": _int(environ, "DB_POOL_MAX_SIZE", 4),
+            "timeout": _int(environ, "DB_POOL_TIMEOUT", 10),
+            "max_idle": _int(environ, "DB_POOL_MAX_IDLE", 300),
+            "check": ConnectionPool.check_connection,
+        }
+    return config
@@ -13,7 +13,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 import os
 from pathlib import Path
 
-import dj_database_url
+from .database import database_config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -50,13 +50,20 @@ INSTALLED_APPS = [
     'finance',
 ]
 
+# Server-Timing headers, slow-request logs and per-URL totals (finance/instrumentation.py).
+FINANCE_REQUEST_TIMING = os.getenv("REQUEST_TIMING", "") == "1"
+FINANCE_SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "500"))
+FINANCE_REQUEST_STATS_FLUSH_SECONDS = 10
+
 MIDDLEWARE = [
+    'finance.instrumentation.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'finance.profiling.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -65,7 +72,12 @@ ROOT_URLCONF = 'cadee_core.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # Same engine; the timed backend adds template render time to Server-Timing.
+        'BACKEND': (
+            'finance.instrumentation.TimedDjangoTemplates'
+            if FINANCE_REQUEST_TIMING
+            else 'django.template.backends.django.DjangoTemplates'
+        ),
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -84,25 +96,40 @@ WSGI_APPLICATION = 'cadee_core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-db_url = (
-    os.getenv("POSTGRES_URL")
-    or os.getenv("DATABASE_URL")
-    or os.getenv("POSTGRES_URL_NON_POOLING")
-    or os.getenv("POSTGRES_URL_NO_SSL")
-)
+# Connection reuse is chosen with DB_CONNECTION_MODE (pooler, pool, persistent,
+# per-request); see cadee_core/database.py.
+
+DATABASES = {
+    "default": database_config(os.environ, BASE_DIR / "db.sqlite3"),
+}
+
+
+# Cache
+# LocMem by default; set CACHE_DIR to share cached dashboards between processes.
 
-if db_url:
-    DATABASES = {
-        "default": dj_database_url.parse(db_url, conn_max_age=600)
+cache_dir = os.getenv("CACHE_DIR")
+if cache_dir:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": cache_dir,
+        }
     }
 else:
-    DATABASES = {
+    CACHES = {
         "default": {
-            "ENGINE": "django.db.backends.sqlite3",
-            "NAME": BASE_DIR / "db.sqlite3",
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "cadee",
         }
     }
 
+# Cached dashboard summaries are versioned per user, so this is only a memory bound.
+FINANCE_DASHBOARD_CACHE_TIMEOUT = 60 * 60 * 24
+FINANCE_ANALYTICS_CACHE_TIMEOUT = 60 * 60 * 24
+
+# manage.py evaluate_budgets raises a "near limit" alert from this share of a limit.
+FINANCE_BUDGET_NEAR_RATIO = 0.8
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -146,8 +173,34 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Uploaded media is served by finance.media.serve_media (owner checks, ETag/Range support).
+# Set to an nginx `internal` location to let nginx send the bytes via X-Accel-Redirect.
+FINANCE_MEDIA_ACCEL_REDIRECT = os.getenv("MEDIA_ACCEL_REDIRECT", "")
+
+# Derivative formats written for uploaded images, best first (skipped if Pillow lacks the codec).
+FINANCE_IMAGE_FORMATS = ("avif", "webp")
+
+# Staff-triggered request profiles (?_profile=1 or X-Profile: 1); see finance/profiling.py.
+FINANCE_PROFILE_DIR = Path(os.getenv("PROFILE_DIR", BASE_DIR / "request_profiles"))
+FINANCE_PROFILES_PER_HOUR = int(os.getenv("PROFILES_PER_HOUR", "30"))
+FINANCE_PROFILE_KEEP = 50
+FINANCE_PROFILE_MAX_BYTES = 2 * 1024 * 1024
+
+# Part of the dashboard/history ETags, so a deploy never revalidates pages rendered by the last one.
+FINANCE_RELEASE = os.getenv("RELEASE") or os.getenv("VERCEL_GIT_COMMIT_SHA", "")
+
+# Rows per page on the transaction history (overridable per request with ?page_size=).
+FINANCE_TRANSACTIONS_PAGE_SIZE = 50
+
 LOGIN_URL = "/login/"
 LOGIN_REDIRECT_URL = "/"
 
 # For completeness if you enable ASGI later.
 ASGI_APPLICATION = 'cadee_core.asgi.application'
+
+# Route the async dashboard/history views (asgi.py turns this on). Under WSGI they
+# would only add an event loop per request, so the sync views stay the default there.
+FINANCE_ASYNC_VIEWS = os.getenv("FINANCE_ASYNC_VIEWS", "") == "1"
+
+# Let the async views run their independent queries on separate connections at once.
+FINANCE_ASYNC_CONCURRENT_QUERIES = os.getenv("FINANCE_ASYNC_CONCURRENT_QUERIES", "1") == "1"
@@ -0,0 +1,38 @@
+"""
+Lean settings for the Vercel function (api/index.py).
+
+Every cold start pays for each installed app, middleware and template library
+before the first response, so this profile keeps only what the finance pages use:
+
+- The admin is served by its own function (api/admin.py, full settings), so its
+  autodiscovery, model admins and template tags are only loaded for /admin/ requests.
+- Static files are served by Vercel's static build, so WhiteNoise and staticfiles
+  (and WhiteNoise's scan of STATIC_ROOT at startup) are left out; `{% static %}`
+  still resolves against STATIC_URL.
+- The messages framework is not used by any view or template.
+
+Measure the difference with `python benchmarks/cold_start.py`.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+LEAN_DROPPED_APPS = (
+    'django.contrib.admin',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+)
+
+LEAN_DROPPED_MIDDLEWARE = (
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+)
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in LEAN_DROPPED_APPS]
+
+MIDDLEWARE = [name for name in MIDDLEWARE if name not in LEAN_DROPPED_MIDDLEWARE]
+
+TEMPLATES[0]['OPTIONS']['context_processors'] = [
+    processor
+    for processor in TEMPLATES[0]['OPTIONS']['context_processors']
+    if processor != 'django.contrib.messages.context_processors.messages'
+]
@@ -14,26 +14,56 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.apps import apps
 from django.conf import settings
-from django.conf.urls.static import static
-from django.contrib import admin
-from django.urls import path
-from finance import views
+from django.urls import path, re_path
+from finance import api, instrumentation, media, views
+
+# Under ASGI the dashboard and history run as async views with concurrent queries.
+if settings.FINANCE_ASYNC_VIEWS:
+    dashboard_view = views.adashboard
+    transaction_list_view = views.atransaction_list
+    transaction_list_more_view = views.atransaction_list_more
+else:
+    dashboard_view = views.dashboard
+    transaction_list_view = views.transaction_list
+    transaction_list_more_view = views.transaction_list_more
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
-    path('', views.dashboard, name='dashboard'),
+    path('', dashboard_view, name='dashboard'),
     path('login/', views.login_screen, name='login'),
     path('register/', views.register_screen, name='register'),
     path('transactions/new/', views.add_transaction, name='add_transaction'),
-    path('transactions/', views.transaction_list, name='transaction_list'),
+    path('transactions/import/', views.import_transactions, name='import_transactions'),
+    path('transactions/export/', views.export_transactions, name='export_transactions'),
+    path('transactions/', transaction_list_view, name='transaction_list'),
+    path('transactions/more/', transaction_list_more_view, name='transaction_list_more'),
     path('limits/edit/', views.edit_limits, name='edit_limits'),
     path('goals/new/', views.add_goal, name='add_goal'),
     path('goals/<int:goal_id>/update/', views.update_goal, name='update_goal'),
     path('goals/<int:goal_id>/delete/', views.delete_goal, name='delete_goal'),
     path('profile/edit/', views.edit_profile, name='edit_profile'),
     path('logout/', views.logout_view, name='logout'),
+    path('api/summary/', api.summary, name='api_summary'),
+    path('api/transactions/', api.transactions, name='api_transactions'),
+    path('api/goals/', api.goals, name='api_goals'),
+    path('api/analytics/', api.analytics, name='api_analytics'),
+    path('api/batch/', api.batch, name='api_batch'),
+    path('ops/request-stats/', instrumentation.request_stats, name='request_stats'),
+    re_path(r'^%s(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'), media.serve_media, name='media'),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# The lean serverless profile leaves the admin out; api/admin.py serves it with full settings.
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+    from finance import profiling
+
+    urlpatterns[:0] = [
+        path('admin/profiles/', admin.site.admin_view(profiling.profile_list), name='request_profiles'),
+        path(
+            'admin/profiles/<slug:profile_id>.prof',
+            admin.site.admin_view(profiling.profile_download),
+            name='request_profile_download',
+        ),
+        path('admin/', admin.site.urls),
+    ]
@@ -1,35 +1,100 @@
 from django.contrib import admin
-from .models import BudgetLimit, Category, PurchaseGoal, Transaction, UserProfile
+from .models import (
+    BudgetAlert, BudgetLimit, Category, GoalContribution, PurchaseGoal, Transaction, UserProfile,
+)
+from .pagination import EstimatedCountPaginator
 
 # Register your models here.
 
+# Large tables: every changelist stays on indexes and runs a fixed number of queries.
+class IndexedSearchMixin:
+    """Search ``user:<username>`` exactly and the rest as a case-sensitive prefix.
+
+    Both map to indexed lookups (the unique username, and ``search_prefix_field``,
+    which carries a ``varchar_pattern_ops`` index on PostgreSQL), where the default
+    ``icontains`` over several fields scans the whole table.
+    """
+
+    search_fields = ("description",)
+    search_prefix_field = "description"
+    search_help_text = "Text the description starts with (case-sensitive), and/or user:<username>."
+
+    def get_search_results(self, request, queryset, search_term):
+        for word in search_term.split():
+            if word.startswith("user:"):
+                queryset = queryset.filter(user__username=word[len("user:"):])
+                search_term = search_term.replace(word, "", 1)
+        prefix = " ".join(search_term.split())
+        if prefix:
+            queryset = queryset.filter(**{f"{self.search_prefix_field}__startswith": prefix})
+        return queryset, False
+
+
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ("full_name", "user", "total_savings")
+    list_select_related = ("user",)
+    autocomplete_fields = ("user",)
     search_fields = ("full_name", "user__username")
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ("name", "user", "color_hex")
+    list_select_related = ("user",)
+    autocomplete_fields = ("user",)
+    # Also what the folder autocomplete on transactions searches.
     search_fields = ("name", "user__username")
 
 
 @admin.register(Transaction)
-class TransactionAdmin(admin.ModelAdmin):
+class TransactionAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ("date", "description", "amount", "folder", "user")
-    list_filter = ("folder", "date")
-    search_fields = ("description", "user__username")
-    ordering = ("-date",)
+    list_select_related = ("folder", "user")
+    # Drill down by year/month/day on txn_date_idx instead of a sidebar of every folder.
+    date_hierarchy = "date"
+    autocomplete_fields = ("user", "folder")
+    ordering = ("-date", "-id")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(PurchaseGoal)
-class PurchaseGoalAdmin(admin.ModelAdmin):
+class PurchaseGoalAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ("description", "user", "target_amount", "current_saved", "deadline", "status")
-    list_filter = ("status", "deadline")
-    search_fields = ("description", "user__username")
+    list_filter = ("status",)
+    list_select_related = ("user",)
+    date_hierarchy = "deadline"
+    autocomplete_fields = ("user",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(BudgetLimit)
 class BudgetLimitAdmin(admin.ModelAdmin):
     list_display = ("user", "weekly_limit", "monthly_limit")
+    list_select_related = ("user",)
+    autocomplete_fields = ("user",)
+    search_fields = ("user__username",)
+
+
+@admin.register(BudgetAlert)
+class BudgetAlertAdmin(admin.ModelAdmin):
+    list_display = ("user", "period", "level", "spent", "limit", "evaluated_on")
+    list_filter = ("period", "level")
+    list_select_related = ("user",)
+    autocomplete_fields = ("user",)
+    search_fields = ("user__username",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(GoalContribution)
+class GoalContributionAdmin(admin.ModelAdmin):
+    list_display = ("goal", "user", "amount", "transaction", "created_at")
+    list_select_related = ("goal", "user", "transaction")
+    autocomplete_fields = ("goal", "user", "transaction")
+    search_fields = ("user__username",)
+    ordering = ("-created_at", "-id")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,187 @@
+"""Spending analytics over an arbitrary date range, in the user's own time zone.
+
+``get_analytics(user, start, end, period)`` returns three series, each computed by one
+grouped query over the user's transactions:
+
+- ``folders``: spend, earnings and transaction count per folder, biggest spend first.
+- ``trend``: earnings and expenses per month or week (``TruncMonth``/``TruncWeek``);
+  periods without transactions are filled with zeros so charts get a continuous axis.
+- ``merchants``: the descriptions with the most spend.
+
+``start`` and ``end`` are inclusive dates in the profile's ``time_zone`` (``TIME_ZONE``
+when blank), and the trend buckets are cut at that zone's midnights. Results are cached
+per user, range and period under the user's data version, so any write recomputes them.
+"""
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .caching import DEFAULT_TIMEOUT, get_data_version
+from .models import Transaction, UserProfile
+
+ZERO = Decimal("0.00")
+PERIODS = {"month": TruncMonth, "week": TruncWeek}
+DEFAULT_MONTHS = 12
+MAX_RANGE_DAYS = 366 * 10
+TOP_MERCHANTS = 10
+ANALYTICS_KEY = "finance:analytics:{user_id}:{version}:{zone}:{start}:{end}:{period}"
+
+
+def _amount_sum(**filters):
+    return Coalesce(
+        Sum("amount", filter=Q(**filters)),
+        Value(ZERO, output_field=DecimalField()),
+    )
+
+
+#Time zone and range
+def get_user_timezone(user):
+    name = UserProfile.objects.filter(user=user).values_list("time_zone", flat=True).first()
+    if name:
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return timezone.get_default_timezone()
+
+
+def default_range(tz, now=None):
+    """The current month and the ``DEFAULT_MONTHS - 1`` before it, up to today."""
+    today = timezone.localdate(now or timezone.now(), tz)
+    month = today.month - (DEFAULT_MONTHS - 1)
+    year = today.year + (month - 1) // 12
+    return today.replace(year=year, month=(month - 1) % 12 + 1, day=1), today
+
+
+def _period_starts(start, end, period):
+    if period == "week":
+        current = start - timedelta(days=start.weekday())
+        while current <= end:
+            yield current
+            current += timedelta(days=7)
+    else:
+        current = start.replace(day=1)
+        while current <= end:
+            yield current
+            current = (current + timedelta(days=32)).replace(day=1)
+
+
+#Grouped queries
+def _in_range(user, start, end, tz):
+    return Transaction.objects.filter(
+        user=user,
+        date__gte=datetime.combine(start, time.min, tzinfo=tz),
+        date__lt=datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz),
+    )
+
+
+def folder_breakdown(transactions):
+    rows = (
+        transactions.values("folder_id", "folder__name", "folder__color_hex")
+        .annotate(
+            spent=_amount_sum(amount__lt=0),
+            earned=_amount_sum(amount__gt=0),
+            count=Count("id"),
+        )
+        .order_by("spent", "folder__name")
+    )
+    return [
+        {
+            "folder": row["folder__name"],
+            "color": row["folder__color_hex"],
+            "spent": -row["spent"],
+            "earned": row["earned"],
+            "count": row["count"],
+        }
+        for row in rows
+    ]
+
+
+def spending_trend(transactions, start, end, tz, period="month"):
+    rows = (
+        transactions.annotate(period=PERIODS[period]("date", tzinfo=tz))
+        .values("period")
+        .annotate(
+            earnings=_amount_sum(amount__gt=0),
+            expenses=_amount_sum(amount__lt=0),
+            count=Count("id"),
+        )
+        .order_by("period")
+    )
+    totals = {timezone.localtime(row["period"], tz).date(): row for row in rows}
+    trend = []
+    for period_start in _period_starts(start, end, period):
+        row = totals.get(period_start)
+        trend.append(
+            {
+                "period": period_start,
+                "earnings": row["earnings"] if row else ZERO,
+                "expenses": -row["expenses"] if row else ZERO,
+                "count": row["count"] if row else 0,
+            }
+        )
+    return trend
+
+
+def top_merchants(transactions, limit=TOP_MERCHANTS):
+    rows = (
+        transactions.filter(amount__lt=0)
+        .values("description")
+        .annotate(spent=Sum("amount"), count=Count("id"))
+        .order_by("spent", "description")[:limit]
+    )
+    return [
+        {"merchant": row["description"], "spent": -row["spent"], "count": row["count"]}
+        for row in rows
+    ]
+
+
+def build_analytics(user, start, end, tz, period="month"):
+    transactions = _in_range(user, start, end, tz)
+    return {
+        "start": start,
+        "end": end,
+        "period": period,
+        "time_zone": str(tz),
+        "folders": folder_breakdown(transactions),
+        "trend": spending_trend(transactions, start, end, tz, period),
+        "merchants": top_merchants(transactions),
+    }
+
+
+#Cached entry point
+def get_analytics(user, start=None, end=None, period="month", now=None):
+    """``build_analytics`` for ``user``'s zone, cached until the user's data changes.
+
+    A missing ``start``/``end`` defaults to ``default_range``. Raises ``ValueError`` for
+    an unknown period, a reversed range or one longer than ``MAX_RANGE_DAYS``.
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period {period!r}; choose from {', '.join(PERIODS)}.")
+    tz = get_user_timezone(user)
+    default_start, default_end = default_range(tz, now)
+    start, end = start or default_start, end or default_end
+    if start > end:
+        raise ValueError("start must not be after end.")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise ValueError(f"The range may span at most {MAX_RANGE_DAYS} days.")
+
+    key = ANALYTICS_KEY.format(
+        user_id=user.pk,
+        version=get_data_version(user.pk),
+        zone=tz,
+        start=start.isoformat(),
+        end=end.isoformat(),
+        period=period,
+    )
+    analytics = cache.get(key)
+    if analytics is None:
+        analytics = build_analytics(user, start, end, tz, period)
+        cache.set(key, analytics, getattr(settings, "FINANCE_ANALYTICS_CACHE_TIMEOUT", DEFAULT_TIMEOUT))
+    return analytics
@@ -0,0 +1,259 @@
+"""Read-only JSON API over the same computations as the dashboard.
+
+``/api/summary/``, ``/api/transactions/`` and ``/api/goals/`` each take ``fields=`` (a
+comma-separated subset, default all). Transactions page with the history's opaque
+``cursor`` and ``page_size``. ``/api/batch/?include=summary,goals,transactions`` returns
+several resources in one round trip; their parameters are prefixed with the resource
+name, e.g. ``transactions.fields=id,amount&transactions.page_size=20``.
+
+``/api/analytics/`` takes ``start`` and ``end`` (``YYYY-MM-DD``, inclusive, in the
+user's time zone; default the last twelve months) and ``period`` (``month`` or
+``week``), and returns per-folder spend, the earnings/expenses trend and top merchants.
+
+Payloads carry only plain strings and numbers (money as decimal strings) and are
+written without whitespace.
+"""
+from datetime import date
+from decimal import Decimal
+from functools import wraps
+
+from django.db.models import F
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+
+from .analytics import get_analytics
+from .caching import get_dashboard_summary
+from .models import Transaction
+from .pagination import keyset_page, parse_page_size
+from .services import get_goal_items
+
+CENTS = Decimal("0.01")
+COMPACT = {"separators": (",", ":"), "ensure_ascii": False}
+
+SUMMARY_FIELDS = (
+    "full_name",
+    "total_savings",
+    "month_earnings",
+    "month_expenses",
+    "week_expenses",
+    "weekly_limit",
+    "monthly_limit",
+    "weekly_spent",
+    "monthly_spent",
+    "weekly_percent",
+    "monthly_percent",
+    "savings_ratio",
+    "weekly_left_days",
+    "monthly_left_days",
+    "recent_transactions",
+)
+TRANSACTION_FIELDS = ("id", "date", "description", "amount", "folder")
+# API field -> key in the rows from ``project_transaction_rows``.
+ROW_KEYS = {"folder": "folder_name"}
+GOAL_FIELDS = (
+    "id",
+    "description",
+    "current_saved",
+    "target_amount",
+    "deadline",
+    "status",
+    "progress",
+    "image",
+)
+ANALYTICS_FIELDS = ("folders", "trend", "merchants")
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _fields(params, allowed):
+    requested = params.get("fields")
+    if not requested:
+        return list(allowed)
+    fields = [name.strip() for name in requested.split(",") if name.strip()]
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise ApiError(
+            f"Unknown field(s) {', '.join(unknown)}; choose from {', '.join(allowed)}."
+        )
+    return fields
+
+
+def _decimal(value):
+    # Two places for money and percentages alike; SQLite sums come back as Decimal("25").
+    return str(Decimal(value).quantize(CENTS)) if value is not None else None
+
+
+def _date(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(f"{name} must be a YYYY-MM-DD date.")
+
+
+def _transaction(row, fields):
+    item = {}
+    for name in fields:
+        value = row[ROW_KEYS.get(name, name)]
+        if name == "date":
+            value = value.isoformat()
+        elif name == "amount":
+            value = _decimal(value)
+        item[name] = value
+    return item
+
+
+#Resources
+def summary_resource(user, params):
+    fields = _fields(params, SUMMARY_FIELDS)
+    summary = get_dashboard_summary(user)
+    payload = {}
+    for name in fields:
+        if name == "full_name":
+            profile = summary["profile"]
+            payload[name] = profile.full_name or user.username
+        elif name == "recent_transactions":
+            payload[name] = [
+                _transaction(row, TRANSACTION_FIELDS) for row in summary["recent_transactions"]
+            ]
+        elif name.endswith("_days"):
+            payload[name] = summary[name]
+        else:
+            payload[name] = _decimal(summary[name])
+    return payload
+
+
+def transactions_resource(user, params):
+    fields = _fields(params, TRANSACTION_FIELDS)
+    # The cursor is built from date and id, so they are always selected.
+    columns = ["id", "date", *(name for name in fields if name not in ("id", "date", "folder"))]
+    aliases = {"folder_name": F("folder__name")} if "folder" in fields else {}
+    rows, next_cursor = keyset_page(
+        Transaction.objects.filter(user=user).values(*columns, **aliases),
+        params.get("cursor"),
+        parse_page_size(params.get("page_size")),
+    )
+    return {
+        "data": [_transaction(row, fields) for row in rows],
+        "next_cursor": next_cursor,
+    }
+
+
+def goals_resource(user, params):
+    fields = _fields(params, GOAL_FIELDS)
+    data = []
+    for goal in get_goal_items(user):
+        item = {}
+        for name in fields:
+            value = goal[name]
+            if name in ("current_saved", "target_amount", "progress"):
+                value = _decimal(value)
+            elif name == "deadline":
+                value = value.isoformat() if value else None
+            elif name == "image":
+                value = value.url if value else None
+            item[name] = value
+        data.append(item)
+    return {"data": data}
+
+
+def analytics_resource(user, params):
+    fields = _fields(params, ANALYTICS_FIELDS)
+    try:
+        analytics = get_analytics(
+            user,
+            start=_date(params, "start"),
+            end=_date(params, "end"),
+            period=params.get("period") or "month",
+        )
+    except ValueError as error:
+        raise ApiError(str(error))
+    payload = {
+        "start": analytics["start"].isoformat(),
+        "end": analytics["end"].isoformat(),
+        "period": analytics["period"],
+        "time_zone": analytics["time_zone"],
+    }
+    for name in fields:
+        items = []
+        for row in analytics[name]:
+            item = dict(row)
+            for key in ("spent", "earned", "earnings", "expenses"):
+                if key in item:
+                    item[key] = _decimal(item[key])
+            if "period" in item:
+                item["period"] = item["period"].isoformat()
+            items.append(item)
+        payload[name] = items
+    return payload
+
+
+RESOURCES = {
+    "summary": summary_resource,
+    "transactions": transactions_resource,
+    "goals": goals_resource,
+    "analytics": analytics_resource,
+}
+
+
+#Views
+def _api_view(build):
+    @wraps(build)
+    @require_safe
+    def view(request):
+        if not request.user.is_authenticated:
+            return JsonResponse({"error": "Authentication required."}, status=401)
+        try:
+            payload = build(request)
+        except ApiError as error:
+            return JsonResponse({"error": str(error)}, status=error.status)
+        return JsonResponse(payload, json_dumps_params=COMPACT)
+
+    return view
+
+
+@_api_view
+def summary(request):
+    return summary_resource(request.user, request.GET)
+
+
+@_api_view
+def transactions(request):
+    return transactions_resource(request.user, request.GET)
+
+
+@_api_view
+def goals(request):
+    return goals_resource(request.user, request.GET)
+
+
+@_api_view
+def analytics(request):
+    return analytics_resource(request.user, request.GET)
+
+
+@_api_view
+def batch(request):
+    names = [name.strip() for name in request.GET.get("include", "").split(",") if name.strip()]
+    if not names:
+        raise ApiError(f"Pass include= with any of {', '.join(RESOURCES)}.")
+    unknown = [name for name in names if name not in RESOURCES]
+    if unknown:
+        raise ApiError(f"Unknown resource(s) {', '.join(unknown)}.")
+
+    payload = {}
+    for name in dict.fromkeys(names):
+        prefix = f"{name}."
+        params = {
+            key[len(prefix):]: value
+            for key, value in request.GET.items()
+            if key.startswith(prefix)
+        }
+        payload[name] = RESOURCES[name](request.user, params)
+    return payload
@@ -1,5 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class FinanceConfig(AppConfig):
     name = 'finance'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .search import ensure_search_triggers
+
+        # Table rebuilds in later migrations drop the SQLite search triggers.
+        post_migrate.connect(ensure_search_triggers, sender=self)
@@ -0,0 +1,41 @@
+"""Run independent ORM lookups at the same time from async views.
+
+Django's async ORM (``aget``, ``aaggregate``, ``async for``) runs every query on one
+shared thread, so ``asyncio.gather`` over it still sends them one after another.
+``gather_queries`` runs each call on a worker thread instead, with that thread's own
+database connection, so the round trips to a remote database overlap.
+
+Worker connections follow the same rules as request connections: they are reused
+while ``CONN_MAX_AGE`` allows and health-checked, or closed (handed back to the pool
+in ``pool`` mode) after each call. With ``FINANCE_ASYNC_CONCURRENT_QUERIES = False``
+the calls run one by one on the ORM thread.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+
+def concurrent_queries_enabled():
+    return getattr(settings, "FINANCE_ASYNC_CONCURRENT_QUERIES", True)
+
+
+def _on_own_connection(call):
+    def run():
+        close_old_connections()
+        try:
+            return call()
+        finally:
+            close_old_connections()
+
+    return run
+
+
+async def gather_queries(*calls):
+    """Await the zero-argument sync ``calls`` and return their results in order."""
+    if not concurrent_queries_enabled():
+        return [await sync_to_async(call)() for call in calls]
+    return await asyncio.gather(
+        *(sync_to_async(_on_own_connection(call), thread_sensitive=False)() for call in calls)
+    )
@@ -0,0 +1,144 @@
+"""Set-based evaluation of every user's weekly and monthly limits into ``BudgetAlert``.
+
+``evaluate_budgets`` walks ``BudgetLimit`` rows in ``user_id`` order, one chunk at a
+time. Each chunk costs:
+
+- one index-only read of the chunk's user ids;
+- one grouped query that joins the chunk's limits to their ``DailyRollup`` rows for the
+  current month and week (the same windows as the dashboard) and, in ``HAVING``, keeps
+  only users at or over ``FINANCE_BUDGET_NEAR_RATIO`` of a limit;
+- the chunk's existing alerts, then bulk writes for the ones that changed.
+
+Memory is bounded by the chunk size. Each chunk commits on its own, so an interrupted
+run picks up from the last committed user id (see ``evaluate_budgets --resume``).
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .caching import bump_data_versions
+from .models import BudgetAlert, BudgetLimit, UserProfile
+
+ZERO = Decimal("0.00")
+DEFAULT_CHUNK_SIZE = 2000
+DEFAULT_NEAR_RATIO = Decimal("0.8")
+LIMIT_FIELDS = {BudgetAlert.Period.WEEK: "weekly", BudgetAlert.Period.MONTH: "monthly"}
+
+
+@dataclass
+class ChunkResult:
+    last_user_id: int
+    alerts: int
+    created: int
+    updated: int
+    cleared: int
+
+
+def near_ratio():
+    return Decimal(str(getattr(settings, "FINANCE_BUDGET_NEAR_RATIO", DEFAULT_NEAR_RATIO)))
+
+
+def alert_level(spent, limit, ratio):
+    if limit <= 0:
+        return None
+    if spent >= limit:
+        return BudgetAlert.Level.BREACHED
+    if spent >= limit * ratio:
+        return BudgetAlert.Level.NEAR
+    return None
+
+
+def _spent(since):
+    return Coalesce(
+        Sum("user__dailyrollup__expenses", filter=Q(user__dailyrollup__day__gte=since)),
+        Value(ZERO, output_field=DecimalField()),
+    )
+
+
+def spending_against_limits(limits, today, ratio):
+    """One grouped query: week and month spend for users in ``limits`` near or over a limit."""
+    start_of_month = today.replace(day=1)
+    start_of_week = today - timedelta(days=6)
+    ratio = Value(ratio, output_field=DecimalField())
+    return (
+        limits.filter(user__dailyrollup__day__gte=min(start_of_month, start_of_week))
+        .values("user_id", "weekly_limit", "monthly_limit")
+        .annotate(weekly_spent=_spent(start_of_week), monthly_spent=_spent(start_of_month))
+        .filter(
+            Q(weekly_limit__gt=0, weekly_spent__gte=F("weekly_limit") * ratio)
+            | Q(monthly_limit__gt=0, monthly_spent__gte=F("monthly_limit") * ratio)
+        )
+        .order_by()
+    )
+
+
+def evaluate_chunk(after, chunk_size, today, ratio):
+    """Evaluate the ``chunk_size`` users with limits after ``after``; ``None`` when done."""
+    user_ids = list(
+        BudgetLimit.objects.filter(user_id__gt=after)
+        .order_by("user_id")
+        .values_list("user_id", flat=True)[:chunk_size]
+    )
+    if not user_ids:
+        return None
+    last_user_id = user_ids[-1]
+    in_chunk = {"user_id__gt": after, "user_id__lte": last_user_id}
+
+    wanted = {}
+    for row in spending_against_limits(BudgetLimit.objects.filter(**in_chunk), today, ratio):
+        for period, name in LIMIT_FIELDS.items():
+            spent, limit = row[f"{name}_spent"], row[f"{name}_limit"]
+            level = alert_level(spent, limit, ratio)
+            if level:
+                wanted[row["user_id"], period] = (level, spent, limit)
+
+    now = timezone.now()
+    with transaction.atomic():
+        existing = {
+            (alert.user_id, alert.period): alert
+            for alert in BudgetAlert.objects.filter(**in_chunk).select_for_update()
+        }
+        created, updated = [], []
+        for key, (level, spent, limit) in wanted.items():
+            alert = existing.pop(key, None)
+            if alert is None:
+                created.append(BudgetAlert(
+                    user_id=key[0], period=key[1], level=level, spent=spent, limit=limit,
+                    evaluated_on=today,
+                ))
+            elif (alert.level, alert.spent, alert.limit) != (level, spent, limit):
+                alert.level, alert.spent, alert.limit = level, spent, limit
+                alert.evaluated_on, alert.updated_at = today, now
+                updated.append(alert)
+        cleared = list(existing.values())
+
+        BudgetAlert.objects.bulk_create(created)
+        BudgetAlert.objects.bulk_update(updated, ["level", "spent", "limit", "evaluated_on", "updated_at"])
+        if cleared:
+            BudgetAlert.objects.filter(pk__in=[alert.pk for alert in cleared]).delete()
+            # A delete leaves no newer updated_at behind; move the dashboard ETag on instead.
+            UserProfile.objects.filter(user_id__in={alert.user_id for alert in cleared}).update(
+                updated_at=now
+            )
+        bump_data_versions({alert.user_id for alert in (*created, *updated, *cleared)})
+
+    return ChunkResult(last_user_id, len(wanted), len(created), len(updated), len(cleared))
+
+
+def evaluate_budgets(after=0, chunk_size=DEFAULT_CHUNK_SIZE, now=None):
+    """Yield a ``ChunkResult`` per committed chunk of users, starting after user id ``after``."""
+    today = timezone.localdate(now or timezone.now())
+    ratio = near_ratio()
+    while True:
+        result = evaluate_chunk(after, chunk_size, today, ratio)
+        if result is None:
+            return
+        yield result
+        after = result.last_user_id
+
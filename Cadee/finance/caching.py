@@ -0,0 +1,114 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .services import abuild_dashboard_summary, build_dashboard_summary, get_days_left
+
+VERSION_KEY = "finance:data-version:{user_id}"
+SUMMARY_KEY = "finance:dashboard:{user_id}:{version}:{day}"
+STATS_KEYS = {"hits": "finance:dashboard-cache:hits", "misses": "finance:dashboard-cache:misses"}
+DEFAULT_TIMEOUT = 60 * 60 * 24
+
+
+#Per-user data version
+def get_data_version(user_id):
+    key = VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so a flushed version never reuses an old summary key.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_data_version(user_id):
+    """Invalidate every cached summary for ``user_id`` once the current write commits."""
+
+    def bump():
+        key = VERSION_KEY.format(user_id=user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def bump_data_versions(user_ids):
+    """``bump_data_version`` for many users in one cache call; each version is reseeded on its next read."""
+    keys = [VERSION_KEY.format(user_id=user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+#Hit/miss counters (kept in the cache so every worker reports into the same numbers)
+def _count(outcome):
+    key = STATS_KEYS[outcome]
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def get_cache_stats():
+    values = cache.get_many(STATS_KEYS.values())
+    stats = {name: values.get(key, 0) for name, key in STATS_KEYS.items()}
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def reset_cache_stats():
+    cache.delete_many(STATS_KEYS.values())
+
+
+#Cached Dashboard Summary
+def _summary_key(user, now):
+    return SUMMARY_KEY.format(
+        user_id=user.pk,
+        version=get_data_version(user.pk),
+        day=timezone.localdate(now).isoformat(),
+    )
+
+
+def _timeout():
+    return getattr(settings, "FINANCE_DASHBOARD_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+
+
+def get_dashboard_summary(user, now=None):
+    """``build_dashboard_summary`` served from the cache until the user's data changes.
+
+    The key also carries the local date because the week and month windows move at
+    midnight; the days-left counters are recomputed on every call.
+    """
+    now = now or timezone.now()
+    key = _summary_key(user, now)
+    summary = cache.get(key)
+    if summary is None:
+        _count("misses")
+        summary = build_dashboard_summary(user, now=now)
+        cache.set(key, summary, timeout=_timeout())
+    else:
+        _count("hits")
+        summary.update(get_days_left(now))
+    return summary
+
+
+async def aget_dashboard_summary(user, now=None):
+    """Async ``get_dashboard_summary``; a miss is rebuilt with ``abuild_dashboard_summary``."""
+    now = now or timezone.now()
+    key = await sync_to_async(_summary_key)(user, now)
+    summary = await cache.aget(key)
+    if summary is None:
+        await sync_to_async(_count)("misses")
+        summary = await abuild_dashboard_summary(user, now=now)
+        await cache.aset(key, summary, timeout=_timeout())
+    else:
+        await sync_to_async(_count)("hits")
+        summary.update(get_days_left(now))
+    return summary
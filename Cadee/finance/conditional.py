@@ -0,0 +1,106 @@
+"""Strong ETags and 304 responses for the dashboard and transaction history.
+
+A page's ETag is derived from the user's data version, the newest ``updated_at``
+across their Transaction, PurchaseGoal, BudgetLimit, BudgetAlert and UserProfile
+rows, read in one query of indexed lookups. It never renders or recomputes the page. Deletes leave
+no row behind, so they (and folder edits, which rename rows on both pages) touch
+the profile's ``updated_at`` instead (see ``finance.signals``).
+
+The tag also carries:
+
+- the local date, because the week/month windows and the days-left counters move at
+  midnight;
+- the CSRF cookie, so a page whose forms hold a rotated token (after login) is sent again;
+- ``FINANCE_RELEASE``, so a deploy that changes the templates invalidates old copies.
+
+Responses are ``Cache-Control: private, no-cache``: browsers keep them but ask every
+time, and an unchanged page costs one query and an empty 304.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from .models import BudgetAlert, BudgetLimit, PurchaseGoal, Transaction, UserProfile
+
+VERSIONED_MODELS = (Transaction, PurchaseGoal, BudgetLimit, BudgetAlert, UserProfile)
+
+
+def _latest_write(model):
+    return Subquery(
+        model.objects.filter(user_id=OuterRef("pk")).order_by("-updated_at").values("updated_at")[:1]
+    )
+
+
+def get_write_version(user_id):
+    """The newest write timestamp across the user's finance rows, or ``None``."""
+    stamps = (
+        get_user_model().objects.filter(pk=user_id)
+        .values_list(*(_latest_write(model) for model in VERSIONED_MODELS))
+        .first()
+    )
+    stamps = [stamp for stamp in stamps or () if stamp is not None]
+    return max(stamps) if stamps else None
+
+
+def touch_write_version(user_id):
+    # For writes that leave no newer updated_at behind: deletes, and folder renames.
+    UserProfile.objects.filter(user_id=user_id).update(updated_at=timezone.now())
+
+
+def page_etag(request):
+    version = get_write_version(request.user.pk)
+    parts = (
+        str(request.user.pk),
+        version.isoformat() if version else "",
+        timezone.localdate().isoformat(),
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        getattr(settings, "FINANCE_RELEASE", ""),
+        request.get_full_path(),
+    )
+    return quote_etag(hashlib.sha256("|".join(parts).encode()).hexdigest()[:32])
+
+
+def _finish(request, response, etag):
+    if response.status_code in (200, 304):
+        response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def etag_page(view):
+    """Answer ``If-None-Match`` from the data version before running ``view``.
+
+    Works on sync and async views; anonymous requests pass straight through.
+    """
+    if iscoroutinefunction(view):
+
+        async def wrapper(request, *args, **kwargs):
+            request.user = user = await request.auser()
+            if not user.is_authenticated or request.method not in ("GET", "HEAD"):
+                return await view(request, *args, **kwargs)
+            etag = await sync_to_async(page_etag)(request)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            return _finish(request, response, etag)
+
+        markcoroutinefunction(wrapper)
+    else:
+
+        def wrapper(request, *args, **kwargs):
+            if not request.user.is_authenticated or request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+            etag = page_etag(request)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return _finish(request, response, etag)
+
+    return wraps(view)(wrapper)
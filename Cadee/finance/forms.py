@@ -1,8 +1,16 @@
+from datetime import timedelta
+from zoneinfo import available_timezones
+
 from django import forms
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
+from django.utils import timezone
+
+from .models import BudgetLimit, Category, GoalContribution, PurchaseGoal, Transaction, UserProfile
 
-from .models import BudgetLimit, PurchaseGoal, Transaction, UserProfile
+# How far back the goal update form offers transactions to link a contribution to.
+LINKABLE_TRANSACTION_DAYS = 60
 
 
 # Creating Transactions
@@ -20,6 +28,33 @@ class TransactionForm(forms.ModelForm):
         if user is not None:
             self.fields["folder"].queryset = self.fields["folder"].queryset.filter(user=user)
 
+#Importing Bank Statements
+class TransactionImportForm(forms.Form):
+    FORMAT_CHOICES = [("", "Detect from file name"), ("csv", "CSV"), ("ofx", "OFX / QFX")]
+
+    statement = forms.FileField()
+    file_format = forms.ChoiceField(choices=FORMAT_CHOICES, required=False)
+    default_folder = forms.CharField(max_length=50, initial="Imported")
+
+#Exporting Transaction History
+class TransactionExportForm(forms.Form):
+    format = forms.ChoiceField(choices=[("csv", "CSV"), ("ndjson", "NDJSON")], required=False)
+    start = forms.DateField(required=False)
+    end = forms.DateField(required=False)
+    folder = forms.ModelChoiceField(queryset=Category.objects.none(), required=False)
+
+    def __init__(self, *args, **kwargs):
+        user = kwargs.pop("user")
+        super().__init__(*args, **kwargs)
+        self.fields["folder"].queryset = Category.objects.filter(user=user)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, end = cleaned_data.get("start"), cleaned_data.get("end")
+        if start and end and start > end:
+            raise forms.ValidationError("Start date must be on or before the end date.")
+        return cleaned_data
+
 #Weekly and Monthly Budget limit setter
 class BudgetLimitForm(forms.ModelForm):
     class Meta:
@@ -35,17 +70,52 @@ class PurchaseGoalForm(forms.ModelForm):
             "deadline": forms.DateInput(attrs={"type": "date"}),
         }
 
-#Updating Save Goal Forms
-class PurchaseGoalUpdateForm(forms.ModelForm):
+#Updating Save Goal Forms (a contribution, applied by finance.goals.contribute, plus the status)
+class GoalContributionForm(forms.ModelForm):
+    status = forms.ChoiceField(choices=PurchaseGoal.Status.choices)
+
     class Meta:
-        model = PurchaseGoal
-        fields = ["current_saved", "status"]
+        model = GoalContribution
+        fields = ["amount", "transaction", "note"]
+
+    def __init__(self, *args, goal, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["status"].initial = goal.status
+        # Blank to only change the status, or to take the amount from the linked transaction.
+        self.fields["amount"].required = False
+        # Transactions already behind a contribution are not offered (or accepted) again.
+        self.fields["transaction"].queryset = Transaction.objects.filter(
+            user_id=goal.user_id,
+            date__gte=timezone.now() - timedelta(days=LINKABLE_TRANSACTION_DAYS),
+            goal_contributions__isnull=True,
+        ).order_by("-date", "-id")
+        self.fields["transaction"].label_from_instance = (
+            lambda txn: f"{txn.date:%b %d} · {txn.description} ({txn.amount})"
+        )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        linked = cleaned_data.get("transaction")
+        if cleaned_data.get("amount") is None and linked is not None:
+            cleaned_data["amount"] = abs(linked.amount)
+        if cleaned_data.get("amount") == 0:
+            self.add_error("amount", "Enter an amount other than zero.")
+        return cleaned_data
 
 #User Profile
+def time_zone_choices():
+    # Read from the tz database on first render, not at import.
+    return [("", f"Default ({settings.TIME_ZONE})")] + [
+        (name, name) for name in sorted(available_timezones())
+    ]
+
+
 class ProfileForm(forms.ModelForm):
+    time_zone = forms.ChoiceField(choices=time_zone_choices, required=False)
+
     class Meta:
         model = UserProfile
-        fields = ["full_name", "profile_image"]
+        fields = ["full_name", "profile_image", "time_zone"]
 
 #Login From 
 class LoginForm(AuthenticationForm):
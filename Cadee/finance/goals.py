@@ -0,0 +1,49 @@
+"""Goal contributions: the history behind ``PurchaseGoal.current_saved``.
+
+``contribute`` records a ``GoalContribution`` and moves the goal's total in the same
+transaction with a single ``UPDATE ... SET current_saved = current_saved + %s``, so
+two tabs saving at once both land. The same statement flips the goal to ACHIEVED
+once the new total reaches the target; a later withdrawal leaves the status alone.
+If either statement fails (e.g. the transaction is already linked to a contribution)
+both roll back, so no contribution is left without its share of the total.
+"""
+from django.db import transaction as db_transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.lookups import GreaterThanOrEqual
+from django.utils import timezone
+
+from .caching import bump_data_version
+from .models import GoalContribution, PurchaseGoal
+
+HISTORY_LIMIT = 10
+
+
+def contribute(goal, amount, transaction=None, note=""):
+    """Add ``amount`` (negative to withdraw) to ``goal`` and refresh its total and status."""
+    with db_transaction.atomic():
+        contribution = GoalContribution.objects.create(
+            goal=goal, user_id=goal.user_id, amount=amount, transaction=transaction, note=note
+        )
+        # Both sides of the update read the row as it was before this statement.
+        PurchaseGoal.objects.filter(pk=goal.pk).update(
+            current_saved=F("current_saved") + amount,
+            status=Case(
+                When(
+                    GreaterThanOrEqual(F("current_saved") + amount, F("target_amount")),
+                    then=Value(PurchaseGoal.Status.ACHIEVED),
+                ),
+                default=F("status"),
+            ),
+            updated_at=timezone.now(),
+        )
+        # update() skips the post_save signal that drops the cached dashboard.
+        bump_data_version(goal.user_id)
+    goal.refresh_from_db(fields=["current_saved", "status", "updated_at"])
+    return contribution
+
+
+def get_contribution_history(goal, limit=HISTORY_LIMIT):
+    return list(
+        goal.contributions.order_by("-created_at", "-id")
+        .values("amount", "note", "created_at", description=F("transaction__description"))[:limit]
+    )
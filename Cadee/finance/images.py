@@ -0,0 +1,170 @@
+"""Content-addressed storage and resized derivatives for uploaded images.
+
+An upload is stored as ``<upload_to>/<digest>.<ext>`` with its metadata stripped,
+and each variant below is written next to it as ``<upload_to>/<digest>/<variant>.<format>``.
+Identical uploads share one digest and are only stored once. Names are derived from
+the content, so the files never change and can be cached forever.
+
+Pillow is imported on first use rather than with the models, so booting the app
+(a serverless cold start in particular) does not pay for it.
+"""
+import hashlib
+import logging
+import os
+import posixpath
+import re
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+VARIANTS = {
+    # Square crop for the 56px avatar and 48px goal thumbnails at up to 2x density.
+    "avatar": {"size": (128, 128), "crop": True},
+    "card": {"size": (480, 480), "crop": False},
+    "full": {"size": (1600, 1600), "crop": False},
+}
+SRCSET_VARIANTS = ("avatar", "card")
+QUALITY = {"avif": 55, "webp": 80}
+ORIGINAL_OPTIONS = {
+    "JPEG": {"quality": 92, "optimize": True},
+    "PNG": {"optimize": True},
+    "WEBP": {"quality": 92},
+}
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+DIGEST_LENGTH = 24
+DIGEST_NAME = re.compile(r"^[0-9a-f]{%d}$" % DIGEST_LENGTH)
+
+
+def available_formats():
+    from PIL import features
+
+    wanted = getattr(settings, "FINANCE_IMAGE_FORMATS", ("avif", "webp"))
+    return [fmt for fmt in wanted if fmt in QUALITY and features.check(fmt)]
+
+
+def content_digest(upload):
+    digest = hashlib.sha256()
+    upload.seek(0)
+    for chunk in iter(lambda: upload.read(64 * 1024), b""):
+        digest.update(chunk)
+    upload.seek(0)
+    return digest.hexdigest()[:DIGEST_LENGTH]
+
+
+def has_derivatives(name):
+    """Only content-addressed names went through the pipeline; older uploads did not."""
+    stem = posixpath.splitext(posixpath.basename(name or ""))[0]
+    return bool(DIGEST_NAME.match(stem))
+
+
+def derivative_name(name, variant, fmt):
+    return f"{posixpath.splitext(name)[0]}/{variant}.{fmt}"
+
+
+def _load(upload):
+    """The upload upright in RGB(A), and the format it was decoded from."""
+    from PIL import Image, ImageOps
+
+    upload.seek(0)
+    image = Image.open(upload)
+    source_format = image.format
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    return image, source_format
+
+
+def _resize(image, spec):
+    from PIL import Image, ImageOps
+
+    if spec["crop"]:
+        return ImageOps.fit(image, spec["size"], Image.Resampling.LANCZOS)
+    resized = image.copy()
+    resized.thumbnail(spec["size"], Image.Resampling.LANCZOS)
+    return resized
+
+
+def _encode(image, fmt, **options):
+    buffer = BytesIO()
+    # Only pixels are written; EXIF, GPS and ICC text chunks from the upload are dropped.
+    image.save(buffer, format=fmt.upper(), **options)
+    return ContentFile(buffer.getvalue())
+
+
+def _stripped_original(image, source_format, ext):
+    """Re-encode in the upload's own format, or as PNG where Pillow cannot write it."""
+    from PIL import Image
+
+    if source_format in Image.SAVE and source_format != "PNG":
+        if source_format == "JPEG":
+            image = image.convert("RGB")
+        if Image.registered_extensions().get(ext) != source_format:
+            ext = "." + source_format.lower()
+        try:
+            return _encode(image, source_format, **ORIGINAL_OPTIONS.get(source_format, {})), ext
+        except (OSError, ValueError):
+            # The writer exists but not for this mode (e.g. RGBA into a format without alpha).
+            pass
+    return _encode(image, "png", **ORIGINAL_OPTIONS["PNG"]), ".png"
+
+
+def write_derivatives(image, name, storage):
+    for variant, spec in VARIANTS.items():
+        resized = _resize(image, spec)
+        for fmt in available_formats():
+            target = derivative_name(name, variant, fmt)
+            if not storage.exists(target):
+                storage.save(target, _encode(resized, fmt, quality=QUALITY[fmt]))
+
+
+def store_upload(field_file):
+    """Run a freshly assigned upload through the pipeline; call before saving the model.
+
+    Files that are already stored, and uploads Pillow cannot read, are left untouched.
+    """
+    if not field_file or getattr(field_file, "_committed", True):
+        return
+    upload = field_file.file
+    from PIL import UnidentifiedImageError
+
+    digest = content_digest(upload)
+    try:
+        image, source_format = _load(upload)
+    except (UnidentifiedImageError, OSError):
+        logger.warning("Could not decode %s; storing it as uploaded.", field_file.name)
+        return
+
+    ext = os.path.splitext(field_file.name)[1].lower()
+    content, ext = _stripped_original(image, source_format, ext)
+    name = field_file.field.generate_filename(field_file.instance, digest + ext)
+    storage = field_file.storage
+    write_derivatives(image, name, storage)
+
+    if storage.exists(name):
+        # Same picture uploaded before: point at the stored copy instead of writing it again.
+        field_file.name = name
+        field_file._committed = True
+    else:
+        field_file.save(digest + ext, content, save=False)
+
+
+def image_sources(field_file, variants=SRCSET_VARIANTS):
+    """``[{"type": ..., "srcset": ...}]`` for a ``<picture>``, best format first."""
+    if not field_file or not has_derivatives(field_file.name):
+        return []
+    storage = field_file.storage
+    return [
+        {
+            "type": MIME_TYPES[fmt],
+            "srcset": ", ".join(
+                f"{storage.url(derivative_name(field_file.name, variant, fmt))} "
+                f"{VARIANTS[variant]['size'][0]}w"
+                for variant in variants
+            ),
+        }
+        for fmt in available_formats()
+    ]
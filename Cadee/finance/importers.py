@@ -0,0 +1,354 @@
+"""Streaming import of bank statements (CSV and OFX) into Transaction rows.
+
+Rows are parsed lazily from the file, validated, mapped onto the user's folders
+and written with ``bulk_create`` in fixed-size batches, so memory stays flat no
+matter how long the statement is.
+"""
+import csv
+import hashlib
+import html
+import io
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal, InvalidOperation
+
+from django.db import IntegrityError, transaction as db_transaction
+from django.utils import timezone
+
+from . import ledger
+from .caching import bump_data_version
+from .models import Category, Transaction
+
+DEFAULT_BATCH_SIZE = 1000
+WRITE_ATTEMPTS = 3
+DEFAULT_FOLDER = "Imported"
+MAX_REPORTED_ERRORS = 20
+CENTS = Decimal("0.01")
+MAX_AMOUNT = Decimal("1e13")
+
+CSV_COLUMNS = {
+    "date": ("date", "posted", "posting date", "transaction date"),
+    "description": ("description", "memo", "payee", "name", "details"),
+    "amount": ("amount",),
+    "debit": ("debit", "withdrawal", "money out"),
+    "credit": ("credit", "deposit", "money in"),
+    "folder": ("folder", "category"),
+    "reference": ("reference", "id", "transaction id", "fitid"),
+}
+DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y", "%Y%m%d")
+OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+OFX_DATE = re.compile(r"(\d{8})(?:(\d{6})(?:\.(\d{1,6}))?)?(?:\[([+-]?\d{1,2}(?:\.\d+)?)(?::[^\]]*)?\])?$")
+
+
+class ImportFormatError(ValueError):
+    """The file as a whole cannot be read (unknown format, missing columns)."""
+
+
+class ImportRowError(ValueError):
+    """A single row is invalid; it is counted and skipped."""
+
+
+@dataclass
+class ImportResult:
+    rows_read: int = 0
+    created: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    skipped: int = 0
+    folders_created: int = 0
+    elapsed: float = 0.0
+    errors: list = field(default_factory=list)
+
+    @property
+    def rows_per_second(self):
+        return self.rows_read / self.elapsed if self.elapsed else 0.0
+
+    def add_error(self, position, message):
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Row {position}: {message}")
+
+
+def _text_stream(stream):
+    if isinstance(stream, io.TextIOBase):
+        return stream
+    return io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+
+
+#CSV
+def parse_csv(stream):
+    """Yield ``(line_number, raw_row)`` pairs from a CSV statement with a header row."""
+    reader = csv.reader(_text_stream(stream))
+    header = next(reader, None)
+    if header is None:
+        return
+
+    aliases = {alias: name for name, options in CSV_COLUMNS.items() for alias in options}
+    columns = {}
+    for index, title in enumerate(header):
+        name = aliases.get(title.strip().lower())
+        if name and name not in columns:
+            columns[name] = index
+    if "date" not in columns or not ({"amount", "debit", "credit"} & columns.keys()):
+        raise ImportFormatError("CSV needs a date column and an amount (or debit/credit) column.")
+
+    def cell(record, name):
+        index = columns.get(name)
+        return record[index].strip() if index is not None and index < len(record) else ""
+
+    for line_number, record in enumerate(reader, start=2):
+        if not any(value.strip() for value in record):
+            continue
+        amount = cell(record, "amount")
+        if not amount:
+            credit, debit = cell(record, "credit"), cell(record, "debit")
+            amount = credit or (f"-{debit.lstrip('-')}" if debit else "")
+        yield line_number, {
+            "date": cell(record, "date"),
+            "amount": amount,
+            "description": cell(record, "description"),
+            "folder": cell(record, "folder"),
+            "reference": cell(record, "reference"),
+        }
+
+
+#OFX (1.x SGML and 2.x XML; read in chunks so one-line files stay bounded too)
+def _ofx_tokens(text, chunk_size=64 * 1024):
+    buffer = ""
+    while True:
+        chunk = text.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+        cut = buffer.rfind("<")
+        if cut <= 0:
+            continue
+        complete, buffer = buffer[:cut], buffer[cut:]
+        yield from OFX_TAG.findall(complete)
+    yield from OFX_TAG.findall(buffer)
+
+
+def _ofx_date(value):
+    """``YYYYMMDD[HHMMSS[.XXX]][gmt offset[:tz name]]``, e.g. ``20240115120000.000[-5:EST]``.
+
+    With an offset the result is aware in that offset; without one it is naive.
+    """
+    match = OFX_DATE.match(value.strip())
+    if not match:
+        raise ImportRowError(f"Unrecognised OFX date {value!r}.")
+    day, clock, fraction, offset = match.groups()
+    parsed = datetime.strptime(day + (clock or ""), "%Y%m%d%H%M%S" if clock else "%Y%m%d")
+    if fraction:
+        parsed = parsed.replace(microsecond=int(fraction.ljust(6, "0")))
+    if offset:
+        # Offsets are hours and may be fractional: [-5:EST], [+5.5:IST], [5.45].
+        parsed = parsed.replace(tzinfo=dt_timezone(timedelta(hours=float(offset))))
+    return parsed
+
+
+def parse_ofx(stream):
+    """Yield ``(transaction_number, raw_row)`` pairs for each ``<STMTTRN>`` block."""
+    current = None
+    count = 0
+    for closing, tag, value in _ofx_tokens(_text_stream(stream)):
+        tag = tag.upper()
+        if tag == "STMTTRN":
+            if closing and current is not None:
+                count += 1
+                yield count, {
+                    "date": current.get("DTPOSTED", ""),
+                    "amount": current.get("TRNAMT", ""),
+                    "description": current.get("NAME") or current.get("MEMO", ""),
+                    "folder": "",
+                    "reference": current.get("FITID", ""),
+                }
+                current = None
+            elif not closing:
+                current = {}
+        elif current is not None and not closing and value.strip():
+            current[tag] = html.unescape(value.strip())
+
+
+PARSERS = {"csv": parse_csv, "ofx": parse_ofx, "qfx": parse_ofx}
+
+
+def detect_format(filename):
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension not in PARSERS:
+        raise ImportFormatError(f"Unsupported statement type {extension or filename!r}.")
+    return extension
+
+
+#Row validation
+def _parse_date(value, date_format=None):
+    formats = (date_format,) if date_format else DATE_FORMATS
+    parsed = None
+    for candidate in formats:
+        try:
+            parsed = datetime.strptime(value, candidate)
+            break
+        except ValueError:
+            continue
+    if parsed is None and not date_format:
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            # OFX style: 20240115120000.000[-5:EST]
+            try:
+                parsed = _ofx_date(value)
+            except ImportRowError:
+                pass
+    if parsed is None:
+        raise ImportRowError(f"Unrecognised date {value!r}.")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _parse_amount(value):
+    text = value.replace(",", "").replace(" ", "")
+    negative = text.startswith("(") and text.endswith(")")
+    text = re.sub(r"[^\d.+-]", "", text)
+    try:
+        amount = Decimal(text).quantize(CENTS)
+    except InvalidOperation:
+        raise ImportRowError(f"Unrecognised amount {value!r}.") from None
+    if abs(amount) >= MAX_AMOUNT:
+        raise ImportRowError(f"Amount {value!r} is out of range.")
+    return -abs(amount) if negative else amount
+
+
+def clean_row(raw, date_format=None):
+    date = _parse_date(raw["date"], date_format)
+    description = raw["description"].strip()[:255]
+    if not description:
+        raise ImportRowError("Missing description.")
+    return {
+        "date": date,
+        "amount": _parse_amount(raw["amount"]),
+        "description": description,
+        "folder": raw.get("folder", "").strip()[:50],
+        "reference": raw.get("reference", "").strip(),
+    }
+
+
+def content_hash(row, occurrence):
+    """Stable identity of a statement row, so re-importing a file skips what is already there.
+
+    ``occurrence`` separates genuinely repeated rows (two identical coffees on one day).
+    """
+    key = "|".join(
+        (
+            row["date"].isoformat(),
+            str(row["amount"]),
+            row["description"],
+            row["reference"],
+            str(occurrence),
+        )
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+#Folder mapping
+class FolderResolver:
+    def __init__(self, user, default_name=DEFAULT_FOLDER):
+        self.user = user
+        self.default_name = default_name or DEFAULT_FOLDER
+        self.created = 0
+        self.ids = {
+            name.lower(): pk
+            for pk, name in Category.objects.filter(user=user).values_list("pk", "name")
+        }
+
+    def resolve(self, name):
+        name = name or self.default_name
+        key = name.lower()
+        if key not in self.ids:
+            self.ids[key] = Category.objects.create(user=self.user, name=name).pk
+            self.created += 1
+        return self.ids[key]
+
+
+#Import
+def _write_batch(user, batch, result):
+    # Another import of the same statement may commit overlapping rows between the
+    # duplicate check and the insert; the unique import_hash then rejects the batch.
+    # Retry so the check sees those rows, and report the batch if it keeps conflicting.
+    for _ in range(WRITE_ATTEMPTS):
+        try:
+            with db_transaction.atomic():
+                hashes = [txn.import_hash for txn in batch]
+                existing = set(
+                    Transaction.objects.filter(user=user, import_hash__in=hashes)
+                    .values_list("import_hash", flat=True)
+                )
+                fresh = []
+                for txn in batch:
+                    if txn.import_hash not in existing:
+                        existing.add(txn.import_hash)
+                        fresh.append(txn)
+                Transaction.objects.bulk_create(fresh)
+                ledger.record_bulk_insert(fresh)
+        except IntegrityError:
+            for txn in batch:
+                txn.pk = None
+            continue
+        result.created += len(fresh)
+        result.duplicates += len(batch) - len(fresh)
+        return
+    result.skipped += len(batch)
+    if len(result.errors) < MAX_REPORTED_ERRORS:
+        result.errors.append(
+            f"{len(batch)} rows skipped while another import of this statement was running."
+        )
+
+
+def import_statement(user, rows, batch_size=DEFAULT_BATCH_SIZE, default_folder=DEFAULT_FOLDER,
+                     date_format=None):
+    """Validate and insert ``(position, raw_row)`` pairs from one of the parsers."""
+    result = ImportResult()
+    folders = FolderResolver(user, default_folder)
+    started = time.perf_counter()
+    batch = []
+    occurrences = defaultdict(Counter)
+
+    for position, raw in rows:
+        result.rows_read += 1
+        try:
+            row = clean_row(raw, date_format)
+        except ImportRowError as error:
+            result.invalid += 1
+            result.add_error(position, error)
+            continue
+
+        # Counted per day for the whole file: statements may be unsorted, and a repeat that
+        # comes back after another day must not restart at 0 and collide with the first copy.
+        identity = (row["date"], row["amount"], row["description"], row["reference"])
+        repeats = occurrences[row["date"].date()]
+        occurrence = repeats[identity]
+        repeats[identity] += 1
+
+        batch.append(
+            Transaction(
+                user=user,
+                folder_id=folders.resolve(row["folder"]),
+                amount=row["amount"],
+                description=row["description"],
+                date=row["date"],
+                import_hash=content_hash(row, occurrence),
+            )
+        )
+        if len(batch) >= batch_size:
+            _write_batch(user, batch, result)
+            batch = []
+
+    if batch:
+        _write_batch(user, batch, result)
+
+    result.folders_created = folders.created
+    result.elapsed = time.perf_counter() - started
+    if result.created:
+        bump_data_version(user.pk)
+    return result
@@ -0,0 +1,291 @@
+"""Per-request SQL, template and view timings (``FINANCE_REQUEST_TIMING``).
+
+``RequestTimingMiddleware`` records each request's query count, database time,
+template render time, view time and total time. It sends them back as a
+``Server-Timing`` header, which the browser's network panel shows next to the
+request.
+
+Requests slower than ``FINANCE_SLOW_REQUEST_MS`` are logged to ``finance.requests``
+with their slowest queries and any query shape that ran more than once (an N+1 loop
+shows up as one fingerprint with a high count).
+
+Totals per URL name are summed in memory and added into the cache every
+``FINANCE_REQUEST_STATS_FLUSH_SECONDS``, so every worker reports into the same
+numbers. Read them with ``manage.py request_stats`` or, as staff, at
+``/ops/request-stats/``.
+
+Queries are caught by an execute wrapper on every connection. That includes the
+worker-thread connections of ``gather_queries``, because the current request travels
+in a context variable. Templates are timed by the ``TimedDjangoTemplates`` backend.
+With the setting off, the middleware removes itself at startup and the wrapper and
+backend only check an unset context variable.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import JsonResponse
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger("finance.requests")
+
+STATS_KEY = "finance:request-stats:{name}:{field}"
+NAMES_KEY = "finance:request-stats:names"
+STAT_FIELDS = ("requests", "errors", "slow", "queries", "total_us", "db_us", "template_us", "view_us")
+SLOWEST_QUERIES = 3
+
+_current = ContextVar("finance_request_timing", default=None)
+
+
+class RequestTiming:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.queries = []  # (seconds, sql)
+        self.template = 0.0
+        self.view = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def db(self):
+        return sum(seconds for seconds, _ in self.queries)
+
+    def add_query(self, seconds, sql):
+        # gather_queries may report from several threads at once.
+        with self.lock:
+            self.queries.append((seconds, sql))
+
+
+#SQL
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """``sql`` with literals and ``IN`` lists collapsed, so repeated shapes compare equal."""
+    sql = _LITERALS.sub("%s", sql)
+    sql = _IN_LISTS.sub("(...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+def _record_query(execute, sql, params, many, context):
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.add_query(time.perf_counter() - started, sql)
+
+
+def _install_wrapper(connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+#Templates
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timing = _current.get()
+        if timing is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timing.template += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """``DjangoTemplates`` whose templates add their render time to the current request."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+#Per-URL-name totals
+class _StatsBuffer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals = defaultdict(Counter)
+        self.flushed = time.monotonic()
+
+    def add(self, name, values):
+        with self.lock:
+            self.totals[name].update(values)
+            interval = getattr(settings, "FINANCE_REQUEST_STATS_FLUSH_SECONDS", 10)
+            if time.monotonic() - self.flushed < interval:
+                return
+            totals, self.totals = self.totals, defaultdict(Counter)
+            self.flushed = time.monotonic()
+        _flush(totals)
+
+
+_buffer = _StatsBuffer()
+
+
+def _incr(key, amount):
+    if not cache.add(key, amount, timeout=None):
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            cache.set(key, amount, timeout=None)
+
+
+def _flush(totals):
+    names = set(cache.get(NAMES_KEY) or ()) | set(totals)
+    cache.set(NAMES_KEY, sorted(names), timeout=None)
+    for name, values in totals.items():
+        for field, amount in values.items():
+            if amount:
+                _incr(STATS_KEY.format(name=name, field=field), amount)
+
+
+def get_request_stats():
+    """Totals per URL name, with per-request averages in milliseconds, busiest first."""
+    names = cache.get(NAMES_KEY) or []
+    keys = {(name, field): STATS_KEY.format(name=name, field=field) for name in names for field in STAT_FIELDS}
+    values = cache.get_many(keys.values())
+    stats = []
+    for name in names:
+        row = {field: values.get(keys[name, field], 0) for field in STAT_FIELDS}
+        count = row["requests"] or 1
+        row.update(
+            name=name,
+            avg_ms=row["total_us"] / count / 1000,
+            avg_db_ms=row["db_us"] / count / 1000,
+            avg_template_ms=row["template_us"] / count / 1000,
+            avg_view_ms=row["view_us"] / count / 1000,
+            avg_queries=row["queries"] / count,
+        )
+        stats.append(row)
+    stats.sort(key=lambda row: row["total_us"], reverse=True)
+    return stats
+
+
+def reset_request_stats():
+    names = cache.get(NAMES_KEY) or []
+    cache.delete_many([STATS_KEY.format(name=name, field=field) for name in names for field in STAT_FIELDS])
+    cache.delete(NAMES_KEY)
+
+
+def request_stats(request):
+    if not (request.user.is_authenticated and request.user.is_staff):
+        return JsonResponse({"error": "Staff only."}, status=403)
+    return JsonResponse({"endpoints": get_request_stats()})
+
+
+#Middleware
+def _ms(seconds):
+    return f"{seconds * 1000:.1f}"
+
+
+def server_timing(timing, total):
+    return ", ".join(
+        (
+            f'db;dur={_ms(timing.db)};desc="{len(timing.queries)} queries"',
+            f"tpl;dur={_ms(timing.template)}",
+            f"view;dur={_ms(timing.view)}",
+            f"total;dur={_ms(total)}",
+        )
+    )
+
+
+def _log_slow_request(request, response, timing, total):
+    slowest = sorted(timing.queries, reverse=True)[:SLOWEST_QUERIES]
+    repeated = [
+        (count, shape)
+        for shape, count in Counter(fingerprint(sql) for _, sql in timing.queries).most_common()
+        if count > 1
+    ]
+    lines = [
+        f"Slow request {request.method} {request.path} -> {response.status_code}: "
+        f"{_ms(total)} ms total, {_ms(timing.view)} ms view, {_ms(timing.template)} ms templates, "
+        f"{len(timing.queries)} queries in {_ms(timing.db)} ms"
+    ]
+    lines += [f"  {_ms(seconds)} ms  {sql[:300]}" for seconds, sql in slowest]
+    lines += [f"  {count}x  {shape[:300]}" for count, shape in repeated]
+    logger.warning("\n".join(lines))
+
+
+class RequestTimingMiddleware:
+    """Times each request and reports it; list it first in ``MIDDLEWARE`` to cover the rest."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "FINANCE_REQUEST_TIMING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        connection_created.connect(_install_wrapper, weak=False, dispatch_uid="finance-request-timing")
+        for connection in connections.all(initialized_only=True):
+            _install_wrapper(connection)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timing = RequestTiming()
+        token = _current.set(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timing)
+
+    async def __acall__(self, request):
+        timing = RequestTiming()
+        token = _current.set(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timing)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timing = _current.get()
+        if timing is not None:
+            timing.view_started = time.perf_counter()
+
+    def _finish(self, request, response, timing):
+        now = time.perf_counter()
+        total = now - timing.started
+        if timing.view_started is not None:
+            timing.view = now - timing.view_started
+        response["Server-Timing"] = server_timing(timing, total)
+
+        slow = total * 1000 >= getattr(settings, "FINANCE_SLOW_REQUEST_MS", 500)
+        if slow:
+            _log_slow_request(request, response, timing, total)
+
+        match = getattr(request, "resolver_match", None)
+        _buffer.add(
+            match.view_name if match else "<unresolved>",
+            {
+                "requests": 1,
+                "errors": int(response.status_code >= 500),
+                "slow": int(slow),
+                "queries": len(timing.queries),
+                "total_us": int(total * 1e6),
+                "db_us": int(timing.db * 1e6),
+                "template_us": int(timing.template * 1e6),
+                "view_us": int(timing.view * 1e6),
+            },
+        )
+        return response
@@ -0,0 +1,210 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction as db_transaction
+from django.db.models import Count, DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import DailyRollup, Transaction, UserProfile
+
+ZERO = Decimal("0.00")
+CENTS = Decimal("0.01")
+
+
+def compute_balance(user_id):
+    # SQLite sums decimals as floats; large ledgers come back a hair off the cent.
+    return Transaction.objects.filter(user_id=user_id).aggregate(
+        total=Coalesce(Sum("amount"), Value(ZERO, output_field=DecimalField()))
+    )["total"].quantize(CENTS)
+
+
+#Profile (seeded with the real balance when it is created late)
+def get_or_create_profile(user):
+    try:
+        return UserProfile.objects.get(user=user)
+    except UserProfile.DoesNotExist:
+        pass
+    profile, _ = UserProfile.objects.get_or_create(
+        user=user,
+        defaults={
+            "full_name": user.get_full_name() or user.username,
+            "total_savings": compute_balance(user.pk),
+        },
+    )
+    return profile
+
+
+#Running Balance
+def adjust_balance(user_id, delta, create_missing=True):
+    """Shift ``UserProfile.total_savings`` by ``delta`` without reading it first."""
+    if not delta:
+        return
+    updated = UserProfile.objects.filter(user_id=user_id).update(
+        total_savings=F("total_savings") + delta
+    )
+    if not updated and create_missing:
+        # No profile yet: create it from the ledger, which already holds this write.
+        get_or_create_profile(get_user_model().objects.get(pk=user_id))
+
+
+#Daily Rollups
+def rollup_delta(values, sign=1):
+    amount = values["amount"]
+    return {
+        "earnings": sign * amount if amount > 0 else ZERO,
+        "expenses": sign * -amount if amount < 0 else ZERO,
+        "transaction_count": sign,
+    }
+
+
+def adjust_rollup(key, delta, create_missing=True):
+    """Add ``delta`` to the rollup row for ``key`` (user_id, folder_id, day)."""
+    rows = DailyRollup.objects.filter(**key)
+    changes = {field: F(field) + value for field, value in delta.items()}
+    if rows.update(**changes) or not create_missing:
+        return
+    try:
+        with db_transaction.atomic():
+            DailyRollup.objects.create(**key, **delta)
+    except IntegrityError:
+        # Another writer created the row first; fold our delta into it.
+        rows.update(**changes)
+
+
+def rollup_key(values):
+    return {
+        "user_id": values["user_id"],
+        "folder_id": values["folder_id"],
+        "day": timezone.localdate(values["date"]),
+    }
+
+
+def aggregate_rollups(transactions):
+    """Group a Transaction queryset into unsaved DailyRollup rows, streamed from the database."""
+    zero = Value(ZERO, output_field=DecimalField())
+    grouped = (
+        transactions.annotate(day=TruncDate("date"))
+        .values("user_id", "folder_id", "day")
+        .annotate(
+            earnings=Coalesce(Sum("amount", filter=Q(amount__gt=0)), zero),
+            expenses=Coalesce(Sum("amount", filter=Q(amount__lt=0)), zero),
+            transaction_count=Count("id"),
+        )
+        .order_by()
+    )
+    for row in grouped.iterator(chunk_size=2000):
+        row["expenses"] = abs(row["expenses"])
+        yield DailyRollup(**row)
+
+
+#Snapshots of the fields the ledger depends on
+SNAPSHOT_FIELDS = ("user_id", "folder_id", "amount", "date")
+
+
+def snapshot(txn):
+    values = {field: getattr(txn, field) for field in SNAPSHOT_FIELDS}
+    values["amount"] = Decimal(str(values["amount"] or ZERO))
+    return values
+
+
+def load_snapshot(pk):
+    """The stored row a save is about to replace, locked until ``Transaction.save`` commits.
+
+    Without the lock two concurrent edits would both read the same old amount and both
+    apply their delta against it. (SQLite has no row locks; its writers serialize.)
+    """
+    return Transaction.objects.select_for_update().filter(pk=pk).values(*SNAPSHOT_FIELDS).first()
+
+
+def _record_rollups(previous, current):
+    if previous and current and rollup_key(previous) == rollup_key(current):
+        delta = rollup_delta(current)
+        for field, value in rollup_delta(previous, sign=-1).items():
+            delta[field] += value
+        adjust_rollup(rollup_key(current), delta)
+        return
+    if previous:
+        adjust_rollup(rollup_key(previous), rollup_delta(previous, sign=-1), create_missing=False)
+    if current:
+        adjust_rollup(rollup_key(current), rollup_delta(current))
+
+
+def _record_balance(previous, current):
+    if previous and current and previous["user_id"] == current["user_id"]:
+        adjust_balance(current["user_id"], current["amount"] - previous["amount"])
+        return
+    if previous:
+        # A delete never recreates a profile; it may be going away in the same cascade.
+        adjust_balance(previous["user_id"], -previous["amount"], create_missing=bool(current))
+    if current:
+        adjust_balance(current["user_id"], current["amount"])
+
+
+def record_change(previous, current):
+    """Apply the balance and rollup deltas between two transaction snapshots.
+
+    Either side may be ``None`` for inserts and deletes.
+    """
+    _record_rollups(previous, current)
+    _record_balance(previous, current)
+
+
+ROLLUP_TOTALS = ("earnings", "expenses", "transaction_count")
+
+
+def _apply_rollup_batch(rollups):
+    # Lock the touched rows, fold the deltas in, then swap them out with one delete + one
+    # insert (much cheaper than bulk_update's CASE expressions on wide batches).
+    existing = {
+        (row.user_id, row.folder_id, row.day): row
+        for row in DailyRollup.objects.select_for_update().filter(
+            user_id__in={user_id for user_id, _, _ in rollups},
+            day__in={day for _, _, day in rollups},
+        )
+    }
+    merged = []
+    for (user_id, folder_id, day), delta in rollups.items():
+        row = existing.get((user_id, folder_id, day))
+        if row is None:
+            merged.append(DailyRollup(user_id=user_id, folder_id=folder_id, day=day, **delta))
+            continue
+        for field, value in delta.items():
+            setattr(row, field, getattr(row, field) + value)
+        merged.append(row)
+
+    DailyRollup.objects.filter(
+        pk__in=[row.pk for row in merged if row.pk is not None]
+    ).delete()
+    try:
+        with db_transaction.atomic():
+            DailyRollup.objects.bulk_create(merged)
+    except IntegrityError:
+        # A concurrent writer created some of the same days; fall back to per-row upserts.
+        for row in merged:
+            adjust_rollup(
+                {"user_id": row.user_id, "folder_id": row.folder_id, "day": row.day},
+                {field: getattr(row, field) for field in ROLLUP_TOTALS},
+            )
+
+
+def record_bulk_insert(transactions):
+    """Ledger bookkeeping for rows written with ``bulk_create``, which skips the signals.
+
+    Call it inside the same atomic block as the insert. A batch costs a fixed
+    number of queries however many (folder, day) pairs it touches.
+    """
+    rollups = {}
+    balances = {}
+    for txn in transactions:
+        values = snapshot(txn)
+        key = (values["user_id"], values["folder_id"], timezone.localdate(values["date"]))
+        delta = rollups.setdefault(key, dict.fromkeys(ROLLUP_TOTALS, 0))
+        for field, value in rollup_delta(values).items():
+            delta[field] += value
+        balances[values["user_id"]] = balances.get(values["user_id"], ZERO) + values["amount"]
+
+    if rollups:
+        _apply_rollup_batch(rollups)
+    for user_id, delta in balances.items():
+        adjust_balance(user_id, delta)
@@ -0,0 +1,36 @@
+import os
+
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand
+
+from finance.images import has_derivatives
+from finance.models import PurchaseGoal, UserProfile
+
+IMAGE_FIELDS = ((UserProfile, "profile_image"), (PurchaseGoal, "image"))
+
+
+class Command(BaseCommand):
+    help = "Move images uploaded before the derivative pipeline onto content-hashed names with variants."
+
+    def handle(self, *args, **options):
+        converted = skipped = 0
+        for model, field_name in IMAGE_FIELDS:
+            for instance in model.objects.exclude(**{field_name: ""}).exclude(**{f"{field_name}__isnull": True}).iterator():
+                field_file = getattr(instance, field_name)
+                if has_derivatives(field_file.name):
+                    continue
+                try:
+                    with field_file.open("rb") as stored:
+                        content = ContentFile(stored.read(), name=os.path.basename(field_file.name))
+                except OSError:
+                    self.stderr.write(f"{model.__name__} {instance.pk}: missing file {field_file.name}")
+                    skipped += 1
+                    continue
+                old_name = field_file.name
+                setattr(instance, field_name, content)
+                # auto_now only applies to fields listed in update_fields; keep the ETag moving.
+                instance.save(update_fields=[field_name, "updated_at"])
+                self.stdout.write(f"{model.__name__} {instance.pk}: {old_name} -> {getattr(instance, field_name).name}")
+                converted += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Converted {converted} images, {skipped} missing."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from finance.caching import get_cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters for the per-user dashboard summary cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the counters afterwards.")
+
+    def handle(self, *args, **options):
+        stats = get_cache_stats()
+        self.stdout.write(
+            f"hits: {stats['hits']}  misses: {stats['misses']}  hit rate: {stats['hit_rate']:.1%}"
+        )
+        if options["reset"]:
+            reset_cache_stats()
+            self.stdout.write("Counters reset.")
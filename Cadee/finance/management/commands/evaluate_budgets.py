@@ -0,0 +1,51 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from finance.budgets import DEFAULT_CHUNK_SIZE, evaluate_budgets
+
+# Last committed user id of today's run; shared between runs when the cache is (CACHE_DIR).
+CHECKPOINT_KEY = "finance:evaluate-budgets:{day}"
+CHECKPOINT_TIMEOUT = 60 * 60 * 24
+
+
+class Command(BaseCommand):
+    help = "Flag weekly/monthly limit breaches and near-breaches for every user into BudgetAlert."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--after", type=int, default=0,
+                            help="Start after this user id (the last one a run reported).")
+        parser.add_argument("--resume", action="store_true",
+                            help="Continue today's interrupted run from its checkpoint.")
+
+    def handle(self, *args, **options):
+        key = CHECKPOINT_KEY.format(day=timezone.localdate().isoformat())
+        after = options["after"]
+        if options["resume"]:
+            after = max(after, cache.get(key, 0))
+            if after:
+                self.stdout.write(f"Resuming after user {after}.")
+
+        started = time.perf_counter()
+        chunks = alerts = created = updated = cleared = 0
+        for result in evaluate_budgets(after=after, chunk_size=options["chunk_size"]):
+            cache.set(key, result.last_user_id, CHECKPOINT_TIMEOUT)
+            chunks += 1
+            alerts += result.alerts
+            created += result.created
+            updated += result.updated
+            cleared += result.cleared
+            if options["verbosity"] > 1:
+                self.stdout.write(f"chunk {chunks}: through user {result.last_user_id}")
+        cache.delete(key)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Evaluated {chunks} chunks in {elapsed:.2f}s: {alerts} active alerts "
+                f"({created} new, {updated} changed, {cleared} cleared)."
+            )
+        )
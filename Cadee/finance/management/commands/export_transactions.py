@@ -0,0 +1,39 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.exporters import ENCODERS, export_rows
+from finance.models import Category
+
+
+class Command(BaseCommand):
+    help = "Stream a user's transactions as CSV or NDJSON to stdout or a file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("--format", choices=sorted(ENCODERS), default="csv")
+        parser.add_argument("--start", type=date.fromisoformat, help="First day, YYYY-MM-DD.")
+        parser.add_argument("--end", type=date.fromisoformat, help="Last day, YYYY-MM-DD.")
+        parser.add_argument("--folder", help="Only this folder (by name).")
+        parser.add_argument("--output", help="Write here instead of stdout.")
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["username"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user named {options['username']!r}.")
+
+        folder = None
+        if options["folder"]:
+            folder = Category.objects.filter(user=user, name=options["folder"]).first()
+            if folder is None:
+                raise CommandError(f"No folder named {options['folder']!r}.")
+
+        rows = export_rows(user, start=options["start"], end=options["end"], folder=folder)
+        lines = ENCODERS[options["format"]](rows)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as target:
+                target.writelines(lines)
+        else:
+            self.stdout.writelines(lines)
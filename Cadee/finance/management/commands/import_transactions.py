@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.importers import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_FOLDER,
+    PARSERS,
+    ImportFormatError,
+    detect_format,
+    import_statement,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV or OFX bank statement into a user's transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=sorted(PARSERS), help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--folder", default=DEFAULT_FOLDER,
+                            help="Folder for rows that do not name one.")
+        parser.add_argument("--date-format", help="strptime format for the date column, e.g. %%d/%%m/%%Y.")
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["username"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user named {options['username']!r}.")
+
+        try:
+            file_format = options["format"] or detect_format(options["path"])
+            with open(options["path"], "rb") as stream:
+                result = import_statement(
+                    user,
+                    PARSERS[file_format](stream),
+                    batch_size=options["batch_size"],
+                    default_folder=options["folder"],
+                    date_format=options["date_format"],
+                )
+        except (ImportFormatError, OSError) as error:
+            raise CommandError(str(error))
+
+        for error in result.errors:
+            self.stderr.write(error)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Read {result.rows_read} rows in {result.elapsed:.2f}s "
+                f"({result.rows_per_second:,.0f} rows/s): {result.created} created, "
+                f"{result.duplicates} duplicates skipped, {result.invalid} invalid, "
+                f"{result.skipped} skipped on conflicts, "
+                f"{result.folders_created} folders created."
+            )
+        )
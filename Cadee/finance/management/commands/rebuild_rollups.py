@@ -0,0 +1,47 @@
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from finance.ledger import aggregate_rollups
+from finance.models import DailyRollup, Transaction
+
+
+class Command(BaseCommand):
+    help = "Rebuild DailyRollup from scratch, streaming users and rollup rows in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user-chunk", type=int, default=200)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--user", type=int, action="append", dest="user_ids",
+                            help="Only rebuild these user ids (repeatable).")
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by("pk")
+        if options["user_ids"]:
+            users = users.filter(pk__in=options["user_ids"])
+        user_ids = users.values_list("pk", flat=True).iterator(chunk_size=options["user_chunk"])
+
+        started = time.perf_counter()
+        written = 0
+        while True:
+            chunk = list(islice(user_ids, options["user_chunk"]))
+            if not chunk:
+                break
+            # Each chunk is swapped atomically so readers never see a half-built day.
+            with transaction.atomic():
+                DailyRollup.objects.filter(user_id__in=chunk).delete()
+                rows = aggregate_rollups(Transaction.objects.filter(user_id__in=chunk))
+                while True:
+                    batch = list(islice(rows, options["batch_size"]))
+                    if not batch:
+                        break
+                    DailyRollup.objects.bulk_create(batch)
+                    written += len(batch)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {written} rollup rows in {elapsed:.2f}s.")
+        )
@@ -0,0 +1,64 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+
+from finance.ledger import CENTS
+from finance.models import Transaction, UserProfile
+
+
+class Command(BaseCommand):
+    help = "Recompute UserProfile.total_savings from the ledger in chunks and report drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without correcting it.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        dry_run = options["dry_run"]
+        checked = drifted = 0
+        last_id = 0
+
+        while True:
+            with transaction.atomic():
+                profiles = list(
+                    UserProfile.objects.select_for_update()
+                    .filter(id__gt=last_id)
+                    .order_by("id")[:chunk_size]
+                )
+                if not profiles:
+                    break
+                last_id = profiles[-1].id
+
+                totals = dict(
+                    Transaction.objects.filter(user_id__in=[p.user_id for p in profiles])
+                    .values("user_id")
+                    .annotate(total=Sum("amount"))
+                    .values_list("user_id", "total")
+                )
+                stale = []
+                for profile in profiles:
+                    expected = (totals.get(profile.user_id) or Decimal("0.00")).quantize(CENTS)
+                    if profile.total_savings != expected:
+                        self.stdout.write(
+                            f"user {profile.user_id}: stored {profile.total_savings}, "
+                            f"ledger {expected} (drift {profile.total_savings - expected})"
+                        )
+                        profile.total_savings = expected
+                        stale.append(profile)
+                if stale and not dry_run:
+                    UserProfile.objects.bulk_update(stale, ["total_savings"])
+
+            checked += len(profiles)
+            drifted += len(stale)
+
+        action = "found" if dry_run else "corrected"
+        self.stdout.write(
+            self.style.SUCCESS(f"Checked {checked} profiles, {action} {drifted} with drift.")
+        )
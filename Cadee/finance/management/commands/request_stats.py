@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from finance.instrumentation import get_request_stats, reset_request_stats
+
+
+class Command(BaseCommand):
+    help = "Show per-URL-name request timings collected with FINANCE_REQUEST_TIMING."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the totals afterwards.")
+
+    def handle(self, *args, **options):
+        stats = get_request_stats()
+        if not stats:
+            self.stdout.write("No requests recorded (is FINANCE_REQUEST_TIMING on?).")
+        else:
+            self.stdout.write(
+                f"{'url name':<28}{'requests':>9}{'5xx':>6}{'slow':>6}{'avg ms':>9}"
+                f"{'db ms':>8}{'tpl ms':>8}{'queries':>9}"
+            )
+            for row in stats:
+                self.stdout.write(
+                    f"{row['name']:<28}{row['requests']:>9}{row['errors']:>6}{row['slow']:>6}"
+                    f"{row['avg_ms']:>9.1f}{row['avg_db_ms']:>8.1f}{row['avg_template_ms']:>8.1f}"
+                    f"{row['avg_queries']:>9.1f}"
+                )
+        if options["reset"]:
+            reset_request_stats()
+            self.stdout.write("Totals reset.")
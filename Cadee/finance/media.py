@@ -0,0 +1,142 @@
+"""Serving uploaded images outside DEBUG, with owner checks and HTTP caching.
+
+Files are answered with ETag/Last-Modified validators (304s), single byte ranges
+(206/416) and ``Cache-Control: immutable`` for content-hashed pipeline files.
+Full responses use ``FileResponse``, which WSGI servers such as gunicorn send with
+``os.sendfile``. With ``FINANCE_MEDIA_ACCEL_REDIRECT`` set, the body is handed to
+nginx via ``X-Accel-Redirect`` and Django only does the access check.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+from .images import DIGEST_NAME, has_derivatives
+from .models import PurchaseGoal, UserProfile
+
+IMMUTABLE = "private, max-age=31536000, immutable"
+REVALIDATE = "private, no-cache"
+RANGE_HEADER = re.compile(r"^bytes=(\d*)-(\d*)$")
+STREAM_BLOCK = 64 * 1024
+OWNED_FIELDS = ((UserProfile, "profile_image"), (PurchaseGoal, "image"))
+
+
+def _original_of(path):
+    """``profiles/<digest>/avatar.webp`` belongs to ``profiles/<digest>.<ext>``."""
+    parent, _ = posixpath.split(path)
+    if DIGEST_NAME.match(posixpath.basename(parent)):
+        return parent + "."
+    return path
+
+
+def is_content_addressed(path):
+    # Pipeline originals and their derivatives never change under the same name.
+    return has_derivatives(path) or _original_of(path) != path
+
+
+def can_view(user, path):
+    if user.is_staff:
+        return True
+    if not user.is_authenticated:
+        return False
+    original = _original_of(path)
+    for model, field in OWNED_FIELDS:
+        if original.endswith("."):
+            lookup = Q(**{f"{field}__startswith": original})
+        else:
+            lookup = Q(**{field: original})
+        if model.objects.filter(lookup, user=user).exists():
+            return True
+    return False
+
+
+def _byte_range(header, size):
+    """``(start, end)`` inclusive for a single satisfiable range, ``None`` to send it all,
+    or ``False`` when the range cannot be satisfied."""
+    match = RANGE_HEADER.match(header.strip())
+    if not match or size == 0:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(STREAM_BLOCK, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+@require_safe
+def serve_media(request, path):
+    if not can_view(request.user, path):
+        raise Http404("No such file.")
+    try:
+        full_path = default_storage.path(path)
+        stat = os.stat(full_path)
+    except (SuspiciousFileOperation, NotImplementedError, OSError):
+        raise Http404("No such file.")
+
+    etag = quote_etag(f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+    # Sent on 304s as well, so a revalidated copy keeps its validators and lifetime.
+    caching = {
+        "ETag": etag,
+        "Last-Modified": http_date(stat.st_mtime),
+        "Cache-Control": IMMUTABLE if is_content_addressed(path) else REVALIDATE,
+    }
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if not_modified is not None:
+        for header, value in caching.items():
+            not_modified[header] = value
+        return not_modified
+
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    byte_range = None
+    if request.headers.get("Range") and request.headers.get("If-Range", etag) == etag:
+        byte_range = _byte_range(request.headers["Range"], stat.st_size)
+
+    accel_prefix = getattr(settings, "FINANCE_MEDIA_ACCEL_REDIRECT", "")
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{stat.st_size}"
+    elif accel_prefix:
+        # nginx serves the bytes (ranges included) from an internal location.
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = accel_prefix.rstrip("/") + "/" + path
+    elif byte_range:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _read_range(full_path, start, end - start + 1), status=206, content_type=content_type
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+        response["Content-Length"] = str(end - start + 1)
+    else:
+        response = FileResponse(open(full_path, "rb"), content_type=content_type)
+
+    response["Accept-Ranges"] = "bytes"
+    for header, value in caching.items():
+        response[header] = value
+    return response
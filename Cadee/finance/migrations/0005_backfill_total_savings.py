@@ -0,0 +1,27 @@
+from django.db import migrations
+from django.db.models import Sum
+
+
+def backfill_total_savings(apps, schema_editor):
+    UserProfile = apps.get_model("finance", "UserProfile")
+    Transaction = apps.get_model("finance", "Transaction")
+
+    totals = dict(
+        Transaction.objects.values("user_id")
+        .annotate(total=Sum("amount"))
+        .values_list("user_id", "total")
+    )
+    for profile in UserProfile.objects.all():
+        profile.total_savings = totals.get(profile.user_id) or 0
+        profile.save(update_fields=["total_savings"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0004_create_default_user"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_total_savings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+
+
+def build_rollups(apps, schema_editor):
+    Transaction = apps.get_model("finance", "Transaction")
+    DailyRollup = apps.get_model("finance", "DailyRollup")
+
+    grouped = (
+        Transaction.objects.annotate(day=TruncDate("date"))
+        .values("user_id", "folder_id", "day")
+        .annotate(
+            earnings=Sum("amount", filter=Q(amount__gt=0)),
+            expenses=Sum("amount", filter=Q(amount__lt=0)),
+            transaction_count=Count("id"),
+        )
+        .order_by()
+    )
+    DailyRollup.objects.bulk_create(
+        (
+            DailyRollup(
+                user_id=row["user_id"],
+                folder_id=row["folder_id"],
+                day=row["day"],
+                earnings=row["earnings"] or 0,
+                expenses=abs(row["expenses"] or 0),
+                transaction_count=row["transaction_count"],
+            )
+            for row in grouped.iterator(chunk_size=2000)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0005_backfill_total_savings"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("earnings", models.DecimalField(decimal_places=2, default=0.0, max_digits=15)),
+                ("expenses", models.DecimalField(decimal_places=2, default=0.0, max_digits=15)),
+                ("transaction_count", models.PositiveIntegerField(default=0)),
+                ("folder", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="rollups", to="finance.category")),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("user", "day", "folder"), name="unique_daily_rollup"),
+                ],
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
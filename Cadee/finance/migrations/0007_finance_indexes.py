@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0006_dailyrollup"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["user", "-date", "-id"], name="txn_user_date_desc_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["user", "date", "amount"], name="txn_user_date_amount_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="purchasegoal",
+            index=models.Index(fields=["user", "deadline"], name="goal_user_deadline_idx"),
+        ),
+    ]
@@ -0,0 +1,34 @@
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def updated_at_field():
+    return models.DateTimeField(auto_now=True, default=django.utils.timezone.now)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0008_transaction_import_hash"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name=model_name,
+            name="updated_at",
+            field=updated_at_field(),
+            preserve_default=False,
+        )
+        for model_name in ("userprofile", "transaction", "purchasegoal", "budgetlimit")
+    ] + [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["user", "updated_at"], name="txn_user_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="purchasegoal",
+            index=models.Index(fields=["user", "updated_at"], name="goal_user_updated_idx"),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0009_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["date"], name="txn_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["description"], name="txn_description_idx", opclasses=["varchar_pattern_ops"]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="purchasegoal",
+            index=models.Index(fields=["deadline"], name="goal_deadline_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="purchasegoal",
+            index=models.Index(
+                fields=["description"], name="goal_description_idx", opclasses=["varchar_pattern_ops"]
+            ),
+        ),
+    ]
@@ -0,0 +1,77 @@
+from django.db import migrations
+
+# See finance/search.py for the queries these serve.
+SQLITE_FORWARD = [
+    # External content: the index stores tokens only and reads rows back from finance_transaction.
+    """
+    CREATE VIRTUAL TABLE finance_transaction_fts USING fts5(
+        user_id, description,
+        content='finance_transaction', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER finance_transaction_fts_insert AFTER INSERT ON finance_transaction BEGIN
+        INSERT INTO finance_transaction_fts(rowid, user_id, description)
+        VALUES (new.id, new.user_id, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER finance_transaction_fts_delete AFTER DELETE ON finance_transaction BEGIN
+        INSERT INTO finance_transaction_fts(finance_transaction_fts, rowid, user_id, description)
+        VALUES ('delete', old.id, old.user_id, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER finance_transaction_fts_update AFTER UPDATE OF user_id, description
+    ON finance_transaction BEGIN
+        INSERT INTO finance_transaction_fts(finance_transaction_fts, rowid, user_id, description)
+        VALUES ('delete', old.id, old.user_id, old.description);
+        INSERT INTO finance_transaction_fts(rowid, user_id, description)
+        VALUES (new.id, new.user_id, new.description);
+    END
+    """,
+    "INSERT INTO finance_transaction_fts(finance_transaction_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS finance_transaction_fts_insert",
+    "DROP TRIGGER IF EXISTS finance_transaction_fts_delete",
+    "DROP TRIGGER IF EXISTS finance_transaction_fts_update",
+    "DROP TABLE IF EXISTS finance_transaction_fts",
+]
+
+POSTGRES_FORWARD = [
+    # Generated, so every write keeps it current without triggers; not a model field.
+    """
+    ALTER TABLE finance_transaction ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple', coalesce(description, ''))) STORED
+    """,
+    "CREATE INDEX txn_search_vector_idx ON finance_transaction USING gin (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS txn_search_vector_idx",
+    "ALTER TABLE finance_transaction DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        vendor_statements = statements.get(schema_editor.connection.vendor, [])
+        for sql in vendor_statements:
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0010_admin_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            _run({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD}),
+        ),
+    ]
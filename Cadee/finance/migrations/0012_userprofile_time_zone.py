@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0011_transaction_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="time_zone",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,35 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0012_userprofile_time_zone"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BudgetAlert",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("period", models.CharField(choices=[("WK", "Weekly"), ("MO", "Monthly")], max_length=2)),
+                ("level", models.CharField(choices=[("NR", "Near limit"), ("BR", "Over limit")], max_length=2)),
+                ("spent", models.DecimalField(decimal_places=2, max_digits=15)),
+                ("limit", models.DecimalField(decimal_places=2, max_digits=15)),
+                ("evaluated_on", models.DateField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("user", "period"), name="unique_budget_alert"),
+                ],
+                "indexes": [
+                    models.Index(fields=["user", "updated_at"], name="alert_user_updated_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0014_goalcontribution"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="goalcontribution",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(transaction__isnull=False),
+                fields=("transaction",),
+                name="unique_contrib_transaction",
+            ),
+        ),
+    ]
@@ -1,7 +1,9 @@
-from django.db import models
+from django.db import models, transaction as db_transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+from . import images
+
 # Create your models here.
 
 #1 Main Dashboard Metadata
@@ -10,6 +12,14 @@ class UserProfile(models.Model):
     full_name = models.CharField(max_length=255)
     total_savings = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
     profile_image = models.ImageField(upload_to='profiles/', blank=True, null=True)
+    # IANA name (e.g. "Asia/Manila") used to bucket analytics by day, week and month; blank means TIME_ZONE.
+    time_zone = models.CharField(max_length=64, blank=True)
+    # Also touched when the user's goals or folders are deleted (see finance.conditional).
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def save(self, *args, **kwargs):
+        images.store_upload(self.profile_image)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.full_name
@@ -31,6 +41,35 @@ class Transaction(models.Model):
     amount = models.DecimalField(max_digits=15, decimal_places=2)
     description = models.CharField(max_length=255)
     date = models.DateTimeField(default=timezone.now)
+    # Content hash of statement rows brought in by finance.importers; blank for manual entries.
+    import_hash = models.CharField(max_length=64, blank=True, null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "import_hash"],
+                condition=models.Q(import_hash__isnull=False),
+                name="unique_txn_import_hash",
+            ),
+        ]
+        indexes = [
+            # Newest-first history, recent entries and (date, id) keyset pages.
+            models.Index(fields=["user", "-date", "-id"], name="txn_user_date_desc_idx"),
+            # Date-range sums by sign without touching the table rows.
+            models.Index(fields=["user", "date", "amount"], name="txn_user_date_amount_idx"),
+            # Latest write per user, for the page ETags.
+            models.Index(fields=["user", "updated_at"], name="txn_user_updated_idx"),
+            # Admin: date_hierarchy bounds and the -date changelist order across all users.
+            models.Index(fields=["date"], name="txn_date_idx"),
+            # Admin: description prefix search (LIKE 'x%' on PostgreSQL, any collation).
+            models.Index(fields=["description"], name="txn_description_idx", opclasses=["varchar_pattern_ops"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        # The ledger signals update UserProfile.total_savings; keep both writes in one transaction.
+        with db_transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
 
 #4 Purchase Goals (Analytics & Wants)
 class PurchaseGoal(models.Model):
@@ -47,9 +86,89 @@ class PurchaseGoal(models.Model):
     image = models.ImageField(upload_to='goals/', blank=True, null=True)
     status = models.CharField(max_length=2, choices=Status.choices, default=Status.WANT)
     deadline = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "deadline"], name="goal_user_deadline_idx"),
+            models.Index(fields=["user", "updated_at"], name="goal_user_updated_idx"),
+            models.Index(fields=["deadline"], name="goal_deadline_idx"),
+            models.Index(fields=["description"], name="goal_description_idx", opclasses=["varchar_pattern_ops"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        images.store_upload(self.image)
+        super().save(*args, **kwargs)
 
 #5 Limits
 class BudgetLimit(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     monthly_limit = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
     weekly_limit = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
+    updated_at = models.DateTimeField(auto_now=True)
+
+#6 Daily Rollups (per user, folder and day; maintained by finance.ledger)
+class DailyRollup(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    folder = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="rollups")
+    day = models.DateField()
+    earnings = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
+    expenses = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
+    transaction_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "day", "folder"], name="unique_daily_rollup"),
+        ]
+
+#7 Budget Alerts (current breaches and near-breaches; written by finance.budgets)
+class BudgetAlert(models.Model):
+    class Period(models.TextChoices):
+        WEEK = 'WK', 'Weekly'
+        MONTH = 'MO', 'Monthly'
+
+    class Level(models.TextChoices):
+        NEAR = 'NR', 'Near limit'
+        BREACHED = 'BR', 'Over limit'
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    period = models.CharField(max_length=2, choices=Period.choices)
+    level = models.CharField(max_length=2, choices=Level.choices)
+    spent = models.DecimalField(max_digits=15, decimal_places=2)
+    limit = models.DecimalField(max_digits=15, decimal_places=2)
+    evaluated_on = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "period"], name="unique_budget_alert"),
+        ]
+        indexes = [
+            models.Index(fields=["user", "updated_at"], name="alert_user_updated_idx"),
+        ]
+
+#8 Goal Contributions (history behind PurchaseGoal.current_saved; written by finance.goals)
+class GoalContribution(models.Model):
+    goal = models.ForeignKey(PurchaseGoal, on_delete=models.CASCADE, related_name="contributions")
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Negative for withdrawals.
+    amount = models.DecimalField(max_digits=15, decimal_places=2)
+    transaction = models.ForeignKey(
+        Transaction, on_delete=models.SET_NULL, blank=True, null=True, related_name="goal_contributions"
+    )
+    note = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            # A transaction funds at most one contribution; unlinked ones are unconstrained.
+            models.UniqueConstraint(
+                fields=["transaction"],
+                condition=models.Q(transaction__isnull=False),
+                name="unique_contrib_transaction",
+            ),
+        ]
+        indexes = [
+            # A goal's history, newest first.
+            models.Index(fields=["goal", "-created_at", "-id"], name="contrib_goal_created_idx"),
+        ]
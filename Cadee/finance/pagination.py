@@ -0,0 +1,116 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+#Opaque cursors over (date, id)
+def encode_cursor(date, pk):
+    raw = f"{date.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Return ``(date, id)`` for a cursor token, or ``None`` if it is missing or malformed."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        date_text, pk_text = raw.split("|", 1)
+        return datetime.fromisoformat(date_text), int(pk_text)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def parse_page_size(value):
+    default = getattr(settings, "FINANCE_TRANSACTIONS_PAGE_SIZE", DEFAULT_PAGE_SIZE)
+    try:
+        size = int(value) if value is not None else default
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def get_page_size(request):
+    return parse_page_size(request.GET.get("page_size"))
+
+
+def _seek(queryset, cursor, ascending=False):
+    if ascending:
+        queryset = queryset.order_by("date", "id")
+    else:
+        queryset = queryset.order_by("-date", "-id")
+    position = decode_cursor(cursor)
+    if position is not None:
+        date, pk = position
+        if ascending:
+            queryset = queryset.filter(Q(date__gt=date) | Q(date=date, id__gt=pk))
+        else:
+            queryset = queryset.filter(Q(date__lt=date) | Q(date=date, id__lt=pk))
+    return queryset
+
+
+def _split_page(rows, page_size):
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, encode_cursor(rows[-1]["date"], rows[-1]["id"])
+    return rows, None
+
+
+def keyset_page(queryset, cursor, page_size, ascending=False):
+    """Fetch one page newest-first, seeking past ``cursor`` instead of using OFFSET.
+
+    ``queryset`` must be a ``values()`` queryset that includes ``date`` and ``id``.
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is ``None`` on the last page.
+    ``ascending`` walks oldest-first instead (cursors are not interchangeable).
+    """
+    rows = list(_seek(queryset, cursor, ascending)[: page_size + 1])
+    return _split_page(rows, page_size)
+
+
+async def akeyset_page(queryset, cursor, page_size):
+    """``keyset_page`` through the async ORM."""
+    rows = [row async for row in _seek(queryset, cursor)[: page_size + 1]]
+    return _split_page(rows, page_size)
+
+
+#Admin changelists
+class EstimatedCountPaginator(Paginator):
+    """``Paginator`` that trusts PostgreSQL's row estimate for whole large tables.
+
+    An unfiltered ``COUNT(*)`` scans the table; ``pg_class.reltuples`` (kept by
+    ANALYZE/autovacuum) is free and close enough for page links. Filtered lists, small
+    tables and other databases get the exact count.
+    """
+
+    exact_below = 100_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if (
+            hasattr(queryset, "query")
+            and not queryset.query.where
+            and connections[queryset.db].vendor == "postgresql"
+        ):
+            estimate = self._estimate(queryset)
+            if estimate >= self.exact_below:
+                return estimate
+        return super().count
+
+    def _estimate(self, queryset):
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return max(int(row[0]), 0) if row else 0
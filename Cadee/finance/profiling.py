@@ -0,0 +1,253 @@
+"""On-demand request profiling for staff.
+
+A staff user adds ``?_profile=1`` or an ``X-Profile: 1`` header to any request. The
+request is then run under ``cProfile``, with ``tracemalloc`` snapshots taken before
+and after it. Two files are written to ``FINANCE_PROFILE_DIR``:
+
+- ``<id>.prof``: the raw call tree, for ``python -m pstats`` or snakeviz;
+- ``<id>.json``: the request, the top functions by cumulative time and the
+  allocation growth by line.
+
+The admin lists them at ``/admin/profiles/``. The response carries ``X-Profile-Id``,
+or ``X-Profile-Skipped`` with the reason when no profile was taken.
+
+Guard rails, so this can stay deployed:
+
+- Only staff can trigger it; the flag is ignored for everyone else.
+- At most ``FINANCE_PROFILES_PER_HOUR`` profiles are taken, counted in the cache
+  across workers.
+- Only one request per process is profiled at a time; the others run normally.
+- Only the newest ``FINANCE_PROFILE_KEEP`` profiles are kept. A ``.prof`` over
+  ``FINANCE_PROFILE_MAX_BYTES`` is dropped, and its summary is kept.
+
+cProfile follows the thread it was started on. Under ASGI the async dashboard and
+history views run on the event loop, so their own code shows up as a single wait.
+"""
+import cProfile
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+from django.utils import timezone
+
+RATE_KEY = "finance:profiles:{hour}"
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 20
+
+_busy = threading.Lock()
+
+
+def profile_dir():
+    return Path(getattr(settings, "FINANCE_PROFILE_DIR", settings.BASE_DIR / "request_profiles"))
+
+
+def wants_profile(request):
+    return request.GET.get("_profile") == "1" or request.headers.get("X-Profile") == "1"
+
+
+def _take_slot():
+    limit = getattr(settings, "FINANCE_PROFILES_PER_HOUR", 30)
+    key = RATE_KEY.format(hour=int(time.time() // 3600))
+    if cache.add(key, 1, timeout=3600):
+        return limit > 0
+    try:
+        return cache.incr(key) <= limit
+    except ValueError:
+        cache.set(key, 1, timeout=3600)
+        return limit > 0
+
+
+# Summaries
+def top_functions(profiler, limit=TOP_FUNCTIONS):
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append(
+            {
+                "function": name,
+                "location": f"{filename}:{line}",
+                "calls": calls,
+                "tottime_ms": round(tottime * 1000, 3),
+                "cumtime_ms": round(cumtime * 1000, 3),
+            }
+        )
+    rows.sort(key=lambda row: row["cumtime_ms"], reverse=True)
+    return rows[:limit]
+
+
+def allocation_growth(before, after, limit=TOP_ALLOCATIONS):
+    return [
+        {
+            "location": str(stat.traceback[0]),
+            "size_kib": round(stat.size_diff / 1024, 1),
+            "count": stat.count_diff,
+        }
+        for stat in after.compare_to(before, "lineno")[:limit]
+        if stat.size_diff
+    ]
+
+
+def _prune(directory):
+    keep = getattr(settings, "FINANCE_PROFILE_KEEP", 50)
+    summaries = sorted(directory.glob("*.json"), reverse=True)
+    for summary in summaries[keep:]:
+        summary.unlink(missing_ok=True)
+        summary.with_suffix(".prof").unlink(missing_ok=True)
+
+
+def _save(request, response, profiler, allocations, elapsed):
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    # Time-ordered names, so sorting the directory lists the newest first.
+    profile_id = f"{timezone.now():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+    raw = directory / f"{profile_id}.prof"
+    profiler.dump_stats(raw)
+    if raw.stat().st_size > getattr(settings, "FINANCE_PROFILE_MAX_BYTES", 2 * 1024 * 1024):
+        raw.unlink()
+
+    match = getattr(request, "resolver_match", None)
+    summary = {
+        "id": profile_id,
+        "created": timezone.now().isoformat(timespec="seconds"),
+        "method": request.method,
+        "path": request.get_full_path(),
+        "url_name": match.view_name if match else "",
+        "user": request.user.get_username(),
+        "status": response.status_code,
+        "duration_ms": round(elapsed * 1000, 2),
+        "has_call_tree": raw.exists(),
+        "functions": top_functions(profiler),
+        "allocations": allocations,
+    }
+    (directory / f"{profile_id}.json").write_text(json.dumps(summary, indent=1))
+    _prune(directory)
+    return profile_id
+
+
+def list_profiles():
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    profiles = []
+    for path in sorted(directory.glob("*.json"), reverse=True):
+        try:
+            profiles.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+
+# Middleware
+class _Capture:
+    """cProfile plus tracemalloc snapshots around whatever runs between start and stop."""
+
+    def start(self):
+        self.tracing = tracemalloc.is_tracing()
+        if not self.tracing:
+            tracemalloc.start()
+        self.before = tracemalloc.take_snapshot()
+        self.profiler = cProfile.Profile()
+        self.started = time.perf_counter()
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+        self.elapsed = time.perf_counter() - self.started
+        after = tracemalloc.take_snapshot()
+        if not self.tracing:
+            tracemalloc.stop()
+        # Snapshots of the snapshots are noise; keep the request's own allocations.
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        self.allocations = allocation_growth(
+            self.before.filter_traces(filters), after.filter_traces(filters)
+        )
+
+    def save(self, request, response):
+        response["X-Profile-Id"] = _save(
+            request, response, self.profiler, self.allocations, self.elapsed
+        )
+
+
+class ProfilingMiddleware:
+    """Profiles flagged staff requests; list it after ``AuthenticationMiddleware``.
+
+    Unflagged requests pass straight through, on the event loop under ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not wants_profile(request) or not request.user.is_staff:
+            return self.get_response(request)
+        if not _busy.acquire(blocking=False):
+            return _skipped(self.get_response(request), "busy")
+        try:
+            if _take_slot():
+                capture = _Capture()
+                capture.start()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    capture.stop()
+                capture.save(request, response)
+                return response
+        finally:
+            _busy.release()
+        return _skipped(self.get_response(request), "rate-limit")
+
+    async def __acall__(self, request):
+        if not wants_profile(request) or not (await request.auser()).is_staff:
+            return await self.get_response(request)
+        if not _busy.acquire(blocking=False):
+            return _skipped(await self.get_response(request), "busy")
+        try:
+            if await sync_to_async(_take_slot)():
+                capture = _Capture()
+                capture.start()
+                try:
+                    response = await self.get_response(request)
+                finally:
+                    capture.stop()
+                await sync_to_async(capture.save)(request, response)
+                return response
+        finally:
+            _busy.release()
+        return _skipped(await self.get_response(request), "rate-limit")
+
+
+def _skipped(response, reason):
+    response["X-Profile-Skipped"] = reason
+    return response
+
+
+# Admin pages (wrapped with admin.site.admin_view in urls.py)
+def profile_list(request):
+    from django.contrib import admin
+
+    context = admin.site.each_context(request)
+    context.update(title="Request profiles", profiles=list_profiles())
+    return render(request, "admin/finance/profiles.html", context)
+
+
+def profile_download(request, profile_id):
+    path = profile_dir() / f"{profile_id}.prof"
+    if not path.is_file():
+        raise Http404("No such profile.")
+    return FileResponse(path.open("rb"), as_attachment=True, filename=path.name)
@@ -0,0 +1,145 @@
+"""Ranked, per-user search over transaction descriptions.
+
+``search_transactions(user, text)`` matches every word of ``text`` as a prefix
+(``cof sta`` finds "Coffee at Starbucks") and returns the history's row dicts, best
+match first, newest first among equals. The index behind it is created by migration
+0011:
+
+- SQLite: an FTS5 table over ``(user_id, description)`` kept in sync by triggers.
+  The user id is an indexed column, so the match itself is scoped to one user, and
+  ``bm25`` ranks the description hits. The schema editor drops the triggers whenever
+  it rebuilds ``finance_transaction`` (most ``AlterField``/``AddField`` operations),
+  so ``ensure_search_triggers`` recreates them, and reindexes, after every migrate.
+- PostgreSQL: a generated ``search_vector`` column with a GIN index, matched with
+  ``to_tsquery`` prefixes and ranked with ``ts_rank``.
+
+Other databases fall back to ``icontains`` per word, without ranking.
+"""
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+from .models import Transaction
+from .services import project_transaction_rows
+
+MAX_TERMS = 8
+DEFAULT_LIMIT = 50
+_WORDS = re.compile(r"\w+")
+
+# bm25 weights per FTS column: the user id only scopes, the description ranks.
+SQLITE_MATCH = """
+    SELECT rowid, bm25(finance_transaction_fts, 0.0, 1.0) AS score
+    FROM finance_transaction_fts
+    WHERE finance_transaction_fts MATCH %s
+    ORDER BY score, rowid DESC
+    LIMIT %s
+"""
+
+SQLITE_FTS_TABLE = "finance_transaction_fts"
+# The same triggers migration 0011 created.
+SQLITE_TRIGGERS = {
+    "finance_transaction_fts_insert": """
+        CREATE TRIGGER IF NOT EXISTS finance_transaction_fts_insert
+        AFTER INSERT ON finance_transaction BEGIN
+            INSERT INTO finance_transaction_fts(rowid, user_id, description)
+            VALUES (new.id, new.user_id, new.description);
+        END
+    """,
+    "finance_transaction_fts_delete": """
+        CREATE TRIGGER IF NOT EXISTS finance_transaction_fts_delete
+        AFTER DELETE ON finance_transaction BEGIN
+            INSERT INTO finance_transaction_fts(finance_transaction_fts, rowid, user_id, description)
+            VALUES ('delete', old.id, old.user_id, old.description);
+        END
+    """,
+    "finance_transaction_fts_update": """
+        CREATE TRIGGER IF NOT EXISTS finance_transaction_fts_update
+        AFTER UPDATE OF user_id, description ON finance_transaction BEGIN
+            INSERT INTO finance_transaction_fts(finance_transaction_fts, rowid, user_id, description)
+            VALUES ('delete', old.id, old.user_id, old.description);
+            INSERT INTO finance_transaction_fts(rowid, user_id, description)
+            VALUES (new.id, new.user_id, new.description);
+        END
+    """,
+}
+
+
+def ensure_search_triggers(using=DEFAULT_DB_ALIAS, **kwargs):
+    """``post_migrate`` receiver: put back FTS triggers a table rebuild dropped.
+
+    Rows written while they were missing are not in the index, so it is rebuilt from
+    ``finance_transaction`` whenever any had to be recreated.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    names = [SQLITE_FTS_TABLE, *SQLITE_TRIGGERS]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT name FROM sqlite_master WHERE name IN ({', '.join(['%s'] * len(names))})", names
+        )
+        present = {name for (name,) in cursor.fetchall()}
+        if SQLITE_FTS_TABLE not in present:
+            # Migration 0011 has not run (or was reversed).
+            return
+        missing = [name for name in SQLITE_TRIGGERS if name not in present]
+        for name in missing:
+            cursor.execute(SQLITE_TRIGGERS[name])
+        if missing:
+            cursor.execute(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')")
+
+
+def search_terms(text):
+    """The words of ``text``, lowercased; punctuation and FTS operators are dropped."""
+    return _WORDS.findall((text or "").lower())[:MAX_TERMS]
+
+
+def _sqlite_query(user_id, terms):
+    words = " AND ".join(f'description:"{term}"*' for term in terms)
+    return f'user_id:"{user_id}" AND {words}'
+
+
+def _sqlite_search(user, terms, limit):
+    with connections[Transaction.objects.db].cursor() as cursor:
+        cursor.execute(SQLITE_MATCH, [_sqlite_query(user.pk, terms), limit])
+        scores = dict(cursor.fetchall())
+    rows = list(project_transaction_rows(Transaction.objects.filter(user=user, id__in=scores)))
+    for row in rows:
+        row["rank"] = -scores[row["id"]]
+    # bm25 ties (same words, same length) keep the newest first.
+    return sorted(rows, key=lambda row: (-row["rank"], -row["date"].timestamp(), -row["id"]))
+
+
+def _postgres_search(user, terms, limit):
+    tsquery = " & ".join(f"{term}:*" for term in terms)
+    transactions = (
+        Transaction.objects.filter(user=user)
+        .alias(matched=RawSQL("search_vector @@ to_tsquery('simple', %s)", [tsquery], BooleanField()))
+        .filter(matched=True)
+    )
+    return list(
+        project_transaction_rows(transactions)
+        .annotate(rank=RawSQL("ts_rank(search_vector, to_tsquery('simple', %s))", [tsquery], FloatField()))
+        .order_by("-rank", "-date", "-id")[:limit]
+    )
+
+
+def _fallback_search(user, terms, limit):
+    transactions = Transaction.objects.filter(user=user)
+    for term in terms:
+        transactions = transactions.filter(description__icontains=term)
+    return list(project_transaction_rows(transactions).order_by("-date", "-id")[:limit])
+
+
+SEARCHES = {"sqlite": _sqlite_search, "postgresql": _postgres_search}
+
+
+def search_transactions(user, text, limit=DEFAULT_LIMIT):
+    """Up to ``limit`` of ``user``'s transactions matching every word of ``text``."""
+    terms = search_terms(text)
+    if not terms:
+        return []
+    vendor = connections[Transaction.objects.db].vendor
+    return SEARCHES.get(vendor, _fallback_search)(user, terms, limit)
@@ -0,0 +1,207 @@
+"""Deterministic synthetic data for load tests and benchmarks (``manage.py seed_finance``).
+
+Each user draws from its own ``random.Random`` seeded with ``(seed, user number)``, so a
+user's folders, transactions, goals and limits depend only on the seed, their number
+and ``until``; adding users never changes the ones before them.
+
+Rows are written with ``bulk_create``. Rollups and balances are computed per user
+chunk in SQL afterwards instead of through the per-row ledger signals.
+"""
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, time as day_time, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction as db_transaction
+from django.db.models import DecimalField, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .ledger import CENTS, ZERO, aggregate_rollups
+from .models import BudgetLimit, Category, DailyRollup, PurchaseGoal, Transaction, UserProfile
+
+# Folder -> (merchants, typical spend, share of the user's expense rows).
+SPENDING = {
+    "Groceries": (("FreshMart", "Puregold", "SM Supermarket", "Corner Store"), 1800, 0.26),
+    "Dining": (("Jollibee", "Coffee Project", "Ramen Nagi", "Mang Inasal", "Starbucks"), 420, 0.24),
+    "Transport": (("Grab", "LRT Beep", "Shell", "Petron", "Angkas"), 260, 0.18),
+    "Utilities": (("Meralco", "Maynilad", "PLDT Fibr", "Globe Postpaid"), 2400, 0.08),
+    "Shopping": (("Lazada", "Shopee", "Uniqlo", "National Book Store"), 1500, 0.14),
+    "Fun": (("Netflix", "Spotify", "Cinema", "Steam"), 650, 0.10),
+}
+INCOME_FOLDER = "Income"
+HOUSING_FOLDER = "Housing"
+RENT = Decimal("15000.00")
+GOALS = ("Emergency fund", "New laptop", "Japan trip", "Bike", "Camera", "Sofa")
+
+
+@dataclass
+class SeedResult:
+    users: int = 0
+    transactions: int = 0
+    goals: int = 0
+    rollups: int = 0
+    elapsed: float = 0.0
+
+
+def _money(value):
+    return Decimal(value).quantize(CENTS)
+
+
+def _timestamp(rng, day):
+    moment = datetime.combine(day, day_time(rng.randrange(7, 23), rng.randrange(60), rng.randrange(60)))
+    return timezone.make_aware(moment)
+
+
+def user_transactions(rng, user, folders, count, start, until):
+    """``count`` transactions between ``start`` and ``until`` for one user, oldest first.
+
+    Salary on the 15th and last day, rent on the 1st, everything else spread randomly.
+    Salary is sized to the spending the row count implies, so balances stay plausible
+    at any scale.
+    """
+    days = (until - start).days + 1
+    names = list(SPENDING)
+    weights = [SPENDING[name][2] for name in names]
+    # Mean of typical * lognormvariate(0, 0.6) is typical * e ** 0.18.
+    mean_spend = sum(SPENDING[name][1] * SPENDING[name][2] for name in names) * 1.197
+    monthly_spend = mean_spend * max(0, count - days // 10) * 30.4 / days
+    salary = _money(Decimal(monthly_spend) * Decimal(rng.uniform(1.05, 1.4)) + RENT)
+    fixed = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        next_day = day + timedelta(days=1)
+        if day.day == 15 or next_day.month != day.month:
+            fixed.append((day, INCOME_FOLDER, "Payroll", salary / 2))
+        if day.day == 1:
+            fixed.append((day, HOUSING_FOLDER, "Rent", -RENT))
+    # Tiny per-user counts keep only the latest paydays and rents.
+    fixed = fixed[max(0, len(fixed) - count):]
+
+    rows = [
+        Transaction(
+            user=user, folder=folders[folder], amount=_money(amount),
+            description=description, date=_timestamp(rng, day),
+        )
+        for day, folder, description, amount in fixed
+    ]
+    for _ in range(count - len(rows)):
+        folder = rng.choices(names, weights)[0]
+        merchants, typical, _ = SPENDING[folder]
+        amount = typical * rng.lognormvariate(0, 0.6)
+        rows.append(
+            Transaction(
+                user=user, folder=folders[folder], amount=-_money(amount),
+                description=rng.choice(merchants),
+                date=_timestamp(rng, start + timedelta(days=rng.randrange(days))),
+            )
+        )
+    rows.sort(key=lambda txn: txn.date)
+    return rows
+
+
+def _seed_user_chunk(numbers, options, result):
+    User = get_user_model()
+    seed, prefix, until = options["seed"], options["prefix"], options["until"]
+    start = until - timedelta(days=int(365 * options["years"]) - 1)
+
+    with db_transaction.atomic():
+        users = User.objects.bulk_create(
+            User(username=f"{prefix}{number:05d}", password=options["password_hash"])
+            for number in numbers
+        )
+        generators = {user.pk: random.Random(f"{seed}:{number}") for user, number in zip(users, numbers)}
+
+        folders = Category.objects.bulk_create(
+            Category(user=user, name=name)
+            for user in users
+            for name in (*SPENDING, HOUSING_FOLDER, INCOME_FOLDER)
+        )
+        by_user = {}
+        for folder in folders:
+            by_user.setdefault(folder.user_id, {})[folder.name] = folder
+
+        rows = (
+            txn
+            for user in users
+            for txn in user_transactions(
+                generators[user.pk], user, by_user[user.pk], options["transactions"], start, until
+            )
+        )
+        while True:
+            batch = list(islice(rows, options["batch_size"]))
+            if not batch:
+                break
+            Transaction.objects.bulk_create(batch)
+            result.transactions += len(batch)
+
+        goals = []
+        for user in users:
+            rng = generators[user.pk]
+            for name in rng.sample(GOALS, min(options["goals"], len(GOALS))):
+                target = _money(rng.randrange(5000, 150000, 500))
+                goals.append(
+                    PurchaseGoal(
+                        user=user, description=name, target_amount=target,
+                        current_saved=_money(target * Decimal(rng.random())),
+                        deadline=until + timedelta(days=rng.randrange(30, 720)),
+                        status=rng.choice(PurchaseGoal.Status.values[:3]),
+                    )
+                )
+        PurchaseGoal.objects.bulk_create(goals)
+        result.goals += len(goals)
+
+        BudgetLimit.objects.bulk_create(
+            BudgetLimit(
+                user=user,
+                weekly_limit=_money(generators[user.pk].randrange(3000, 12000, 500)),
+                monthly_limit=_money(generators[user.pk].randrange(15000, 50000, 1000)),
+            )
+            for user in users
+        )
+
+        user_ids = [user.pk for user in users]
+        balances = dict(
+            Transaction.objects.filter(user_id__in=user_ids)
+            .values_list("user_id")
+            .annotate(total=Coalesce(Sum("amount"), Value(ZERO, output_field=DecimalField())))
+        )
+        UserProfile.objects.bulk_create(
+            UserProfile(user=user, full_name=f"Seed User {number}", total_savings=balances.get(user.pk, ZERO))
+            for user, number in zip(users, numbers)
+        )
+        rollups = aggregate_rollups(Transaction.objects.filter(user_id__in=user_ids))
+        while True:
+            batch = list(islice(rollups, options["batch_size"]))
+            if not batch:
+                break
+            DailyRollup.objects.bulk_create(batch)
+            result.rollups += len(batch)
+    result.users += len(users)
+
+
+def seed_finance(users=10, transactions=1000, years=3, goals=4, seed=0, until=None,
+                 prefix="seed", password=None, batch_size=5000, user_chunk=50):
+    """Create ``users`` users named ``<prefix>00001``... with their finance data."""
+    options = {
+        "transactions": transactions,
+        "years": years,
+        "goals": goals,
+        "seed": seed,
+        "until": until or timezone.localdate(),
+        "prefix": prefix,
+        # One hash for everyone: hashing per user would dominate the run.
+        "password_hash": make_password(password),
+        "batch_size": batch_size,
+    }
+    result = SeedResult()
+    started = time.perf_counter()
+    numbers = range(1, users + 1)
+    for index in range(0, users, user_chunk):
+        _seed_user_chunk(numbers[index:index + user_chunk], options, result)
+    result.elapsed = time.perf_counter() - started
+    return result
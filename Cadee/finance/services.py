@@ -0,0 +1,203 @@
+from decimal import Decimal
+import calendar
+from datetime import timedelta
+from functools import partial
+
+from django.db.models import DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .asyncdb import gather_queries
+from .ledger import get_or_create_profile
+from .models import BudgetAlert, BudgetLimit, DailyRollup, PurchaseGoal, Transaction, UserProfile
+
+ZERO = Decimal("0.00")
+HUNDRED = Decimal("100.0")
+GOAL_COLUMNS = ("id", "description", "current_saved", "target_amount", "deadline", "status", "image")
+
+
+def _rollup_sum(field, **filters):
+    return Coalesce(
+        Sum(field, filter=Q(**filters)),
+        Value(ZERO, output_field=DecimalField()),
+    )
+
+
+def _capped_percent(part, whole):
+    if whole > 0:
+        return min(HUNDRED, (part / whole) * 100)
+    return Decimal("0.0")
+
+
+#Profile + Limits (one query, created lazily on first visit)
+def get_profile_and_budget(user):
+    try:
+        profile = UserProfile.objects.select_related("user__budgetlimit").get(user=user)
+    except UserProfile.DoesNotExist:
+        profile = get_or_create_profile(user)
+    try:
+        budget = profile.user.budgetlimit
+    except BudgetLimit.DoesNotExist:
+        budget, _ = BudgetLimit.objects.get_or_create(user=user)
+    return profile, budget
+
+
+#Period Totals (one conditional aggregation over at most a month of daily rollups)
+def get_period_totals(user, now=None):
+    today = timezone.localdate(now or timezone.now())
+    start_of_month = today.replace(day=1)
+    start_of_week = today - timedelta(days=6)
+
+    # No upper bound: future-dated (scheduled) entries count, as they always have.
+    totals = DailyRollup.objects.filter(
+        user=user, day__gte=min(start_of_month, start_of_week)
+    ).aggregate(
+        month_earnings=_rollup_sum("earnings", day__gte=start_of_month),
+        month_expenses=_rollup_sum("expenses", day__gte=start_of_month),
+        week_expenses=_rollup_sum("expenses", day__gte=start_of_week),
+    )
+    return totals
+
+
+#Goals (one query for every goal's progress)
+def get_goal_items(user):
+    goals = []
+    for goal in PurchaseGoal.objects.filter(user=user).order_by("deadline").only(*GOAL_COLUMNS):
+        target = goal.target_amount or ZERO
+        saved = goal.current_saved or ZERO
+        progress = (saved / target * 100) if target > 0 else Decimal("0.0")
+        goals.append(
+            {
+                "id": goal.id,
+                "description": goal.description,
+                "current_saved": saved,
+                "target_amount": target,
+                "deadline": goal.deadline,
+                "status": goal.status,
+                "status_label": goal.get_status_display(),
+                "image": goal.image,
+                "progress": min(HUNDRED, progress),
+            }
+        )
+    return goals
+
+
+#Budget alerts (raised by the evaluate_budgets job, weekly before monthly)
+def get_budget_alerts(user):
+    return list(
+        BudgetAlert.objects.filter(user=user)
+        .order_by("-period")
+        .values("period", "level", "spent", "limit")
+    )
+
+
+#Transaction rows (only the columns the lists render, as plain dicts)
+def project_transaction_rows(transactions):
+    return transactions.values(
+        "id", "description", "date", "amount", folder_name=F("folder__name")
+    )
+
+
+def get_recent_transactions(user, limit=5):
+    return list(
+        project_transaction_rows(Transaction.objects.filter(user=user))
+        .order_by("-date", "-id")[:limit]
+    )
+
+
+def get_days_left(now=None):
+    """The clock-dependent part of the summary; cheap enough to recompute per request."""
+    now = now or timezone.now()
+    days_in_month = calendar.monthrange(now.year, now.month)[1]
+    return {
+        "weekly_left_days": max(0, 7 - now.isoweekday()),
+        "monthly_left_days": max(0, days_in_month - now.day),
+    }
+
+
+def empty_dashboard_summary():
+    return {
+        "profile": None,
+        "recent_transactions": [],
+        "total_savings": ZERO,
+        "month_earnings": ZERO,
+        "month_expenses": ZERO,
+        "week_expenses": ZERO,
+        "weekly_limit": ZERO,
+        "monthly_limit": ZERO,
+        "weekly_spent": ZERO,
+        "monthly_spent": ZERO,
+        "weekly_percent": Decimal("0.0"),
+        "monthly_percent": Decimal("0.0"),
+        "weekly_left_days": 0,
+        "monthly_left_days": 0,
+        "savings_ratio": Decimal("0.0"),
+        "goals": [],
+        "budget_alerts": [],
+    }
+
+
+#Dashboard Summary
+def assemble_dashboard_summary(profile, budget, totals, recent_transactions, goals, alerts, now):
+    weekly_spent = totals["week_expenses"]
+    monthly_spent = totals["month_expenses"]
+    month_earnings = totals["month_earnings"]
+    weekly_limit = budget.weekly_limit or ZERO
+    monthly_limit = budget.monthly_limit or ZERO
+
+    savings_ratio = (
+        ((month_earnings - monthly_spent) / month_earnings) * 100
+        if month_earnings > 0
+        else Decimal("0.0")
+    )
+
+    summary = empty_dashboard_summary()
+    summary.update(totals)
+    summary.update(
+        {
+            "profile": profile,
+            "total_savings": profile.total_savings,
+            "recent_transactions": recent_transactions,
+            "weekly_limit": weekly_limit,
+            "monthly_limit": monthly_limit,
+            "weekly_spent": weekly_spent,
+            "monthly_spent": monthly_spent,
+            "weekly_percent": _capped_percent(weekly_spent, weekly_limit),
+            "monthly_percent": _capped_percent(monthly_spent, monthly_limit),
+            "savings_ratio": savings_ratio,
+            "goals": goals,
+            "budget_alerts": alerts,
+        }
+    )
+    summary.update(get_days_left(now))
+    return summary
+
+
+def build_dashboard_summary(user, now=None):
+    """Everything the dashboard renders for ``user`` in a fixed number of queries."""
+    now = now or timezone.now()
+    profile, budget = get_profile_and_budget(user)
+    return assemble_dashboard_summary(
+        profile,
+        budget,
+        get_period_totals(user, now=now),
+        get_recent_transactions(user),
+        get_goal_items(user),
+        get_budget_alerts(user),
+        now,
+    )
+
+
+async def abuild_dashboard_summary(user, now=None):
+    """``build_dashboard_summary`` for async views, with the five lookups in flight at once."""
+    now = now or timezone.now()
+    (profile, budget), totals, recent_transactions, goals, alerts = await gather_queries(
+        partial(get_profile_and_budget, user),
+        partial(get_period_totals, user, now=now),
+        partial(get_recent_transactions, user),
+        partial(get_goal_items, user),
+        partial(get_budget_alerts, user),
+    )
+    return assemble_dashboard_summary(
+        profile, budget, totals, recent_transactions, goals, alerts, now
+    )
@@ -0,0 +1,56 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import ledger
+from .caching import bump_data_version
+from .conditional import touch_write_version
+from .models import BudgetLimit, Category, PurchaseGoal, Transaction, UserProfile
+
+
+#Running balance + daily rollup bookkeeping for every Transaction write
+@receiver(pre_save, sender=Transaction)
+def remember_previous_transaction(sender, instance, raw=False, **kwargs):
+    instance._ledger_previous = None
+    if instance.pk and not raw:
+        instance._ledger_previous = ledger.load_snapshot(instance.pk)
+
+
+@receiver(post_save, sender=Transaction)
+def apply_transaction_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_ledger_previous", None)
+    ledger.record_change(previous, ledger.snapshot(instance))
+    instance._ledger_previous = None
+
+
+@receiver(post_delete, sender=Transaction)
+def apply_transaction_delete(sender, instance, **kwargs):
+    ledger.record_change(ledger.snapshot(instance), None)
+
+
+#Any write to data the dashboard or analytics render invalidates that user's cached results
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_save, sender=PurchaseGoal)
+@receiver(post_delete, sender=PurchaseGoal)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=BudgetLimit)
+@receiver(post_delete, sender=BudgetLimit)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_dashboard_cache(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_data_version(instance.user_id)
+
+
+#Writes that leave no newer updated_at behind still have to change the page ETags
+@receiver(post_delete, sender=Transaction)
+@receiver(post_delete, sender=PurchaseGoal)
+@receiver(post_delete, sender=BudgetLimit)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def touch_page_version(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_write_version(instance.user_id)
@@ -1,178 +1,82 @@
-from decimal import Decimal
-import calendar
-from datetime import timedelta
-
+from asgiref.sync import sync_to_async
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login as auth_login, logout as auth_logout
-from django.db.models import Sum, Value
-from django.db.models.functions import Coalesce
-from django.db.models import DecimalField
+from django.db import IntegrityError
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
 from django.shortcuts import redirect, render
-from django.utils import timezone
 
 from .models import BudgetLimit, Category, PurchaseGoal, Transaction, UserProfile
 from .forms import (
     BudgetLimitForm,
+    GoalContributionForm,
     LoginForm,
     ProfileForm,
     PurchaseGoalForm,
-    PurchaseGoalUpdateForm,
     RegisterForm,
+    TransactionExportForm,
     TransactionForm,
+    TransactionImportForm,
 )
+from .goals import contribute, get_contribution_history
+from .ledger import get_or_create_profile
+from .pagination import akeyset_page, get_page_size, keyset_page
+from .caching import aget_dashboard_summary, get_dashboard_summary
+from .conditional import etag_page
+from .search import search_transactions
+from .services import empty_dashboard_summary, project_transaction_rows
 
-#Purchase History Transaction Logic 
-def _build_transaction_items(transactions):
-    items = []
-    for txn in transactions:
-        amount = txn.amount or Decimal("0.00")
-        is_negative = amount < 0
-        amount_display = abs(amount)
-        items.append(
-            {
-                "description": txn.description,
-                "date": txn.date,
-                "folder": txn.folder,
-                "amount": amount,
-                "amount_display": amount_display,
-                "is_negative": is_negative,
-            }
-        )
-    return items
+# Create your views here.
 
+def _dashboard_context(folders, summary):
+    return {
+        'folders': folders,
+        'transactions': summary["recent_transactions"],
+        'profile': summary["profile"],
+        'total_savings': summary["total_savings"],
+        'month_earnings': summary["month_earnings"],
+        'month_expenses': summary["month_expenses"],
+        'week_expenses': summary["week_expenses"],
+        'weekly_limit': summary["weekly_limit"],
+        'monthly_limit': summary["monthly_limit"],
+        'weekly_spent': summary["weekly_spent"],
+        'monthly_spent': summary["monthly_spent"],
+        'weekly_percent': summary["weekly_percent"],
+        'monthly_percent': summary["monthly_percent"],
+        'weekly_left_days': summary["weekly_left_days"],
+        'monthly_left_days': summary["monthly_left_days"],
+        'savings_ratio': summary["savings_ratio"],
+        'goals': summary["goals"],
+        'budget_alerts': summary["budget_alerts"],
+        'currency_symbol': "\u20b1",
+    }
 
-# Create your views here.
 
+@etag_page
 def dashboard(request):
     # Fetch data from folder stack, guard anonymous users.
     if request.user.is_authenticated:
         folders = Category.objects.filter(user=request.user)
-        profile, _ = UserProfile.objects.get_or_create(
-            user=request.user,
-            defaults={"full_name": request.user.get_full_name() or request.user.username},
-        )
-        budget, _ = BudgetLimit.objects.get_or_create(user=request.user)
-
-        transactions = (
-            Transaction.objects.filter(user=request.user)
-            .select_related("folder")
-            .order_by("-date")
-        )
-        recent_transactions = transactions[:5]
-        transaction_items = _build_transaction_items(recent_transactions)
-
-        now = timezone.now()
-        start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        start_of_week = now - timedelta(days=7)
-
-        zero = Value(Decimal("0.00"), output_field=DecimalField())
-
-        total_savings = (
-            transactions.aggregate(total=Coalesce(Sum("amount"), zero))["total"]
-        )
-
-        month_earnings = (
-            transactions.filter(date__gte=start_of_month, amount__gt=0)
-            .aggregate(total=Coalesce(Sum("amount"), zero))["total"]
-        )
-        month_expenses = (
-            transactions.filter(date__gte=start_of_month, amount__lt=0)
-            .aggregate(total=Coalesce(Sum("amount"), zero))["total"]
-        )
-        month_expenses_abs = abs(month_expenses)
-
-        week_expenses = (
-            transactions.filter(date__gte=start_of_week, amount__lt=0)
-            .aggregate(total=Coalesce(Sum("amount"), zero))["total"]
-        )
-        week_expenses_abs = abs(week_expenses)
-
-        weekly_spent = week_expenses_abs
-        monthly_spent = month_expenses_abs
-
-        weekly_limit = budget.weekly_limit or Decimal("0.00")
-        monthly_limit = budget.monthly_limit or Decimal("0.00")
-        weekly_percent = (
-            min(Decimal("100.0"), (weekly_spent / weekly_limit) * 100)
-            if weekly_limit > 0
-            else Decimal("0.0")
-        )
-        monthly_percent = (
-            min(Decimal("100.0"), (monthly_spent / monthly_limit) * 100)
-            if monthly_limit > 0
-            else Decimal("0.0")
-        )
-
-        weekly_left_days = max(0, 7 - now.isoweekday())
-        days_in_month = calendar.monthrange(now.year, now.month)[1]
-        monthly_left_days = max(0, days_in_month - now.day)
-
-        savings_ratio = (
-            ((month_earnings - month_expenses_abs) / month_earnings) * 100
-            if month_earnings > 0
-            else Decimal("0.0")
-        )
-
-        goals = []
-        for goal in PurchaseGoal.objects.filter(user=request.user).order_by("deadline"):
-            target = goal.target_amount or Decimal("0.00")
-            saved = goal.current_saved or Decimal("0.00")
-            progress = (saved / target * 100) if target > 0 else Decimal("0.0")
-            goals.append(
-                {
-                    "id": goal.id,
-                    "description": goal.description,
-                    "current_saved": saved,
-                    "target_amount": target,
-                    "deadline": goal.deadline,
-                    "status": goal.status,
-                    "status_label": goal.get_status_display(),
-                    "image": goal.image,
-                    "progress": min(Decimal("100.0"), progress),
-                }
-            )
+        summary = get_dashboard_summary(request.user)
     else:
         folders = Category.objects.none()
-        recent_transactions = Transaction.objects.none()
-        transaction_items = []
-        profile = None
-        budget = None
-        month_earnings = Decimal("0.00")
-        month_expenses_abs = Decimal("0.00")
-        week_expenses_abs = Decimal("0.00")
-        weekly_limit = Decimal("0.00")
-        monthly_limit = Decimal("0.00")
-        weekly_spent = Decimal("0.00")
-        monthly_spent = Decimal("0.00")
-        weekly_percent = Decimal("0.0")
-        monthly_percent = Decimal("0.0")
-        weekly_left_days = 0
-        monthly_left_days = 0
-        savings_ratio = Decimal("0.0")
-        goals = []
-
-    context = {
-        'folders': folders,
-        'transactions': transaction_items,
-        'profile': profile,
-        'total_savings': total_savings if request.user.is_authenticated else Decimal("0.00"),
-        'month_earnings': month_earnings,
-        'month_expenses': month_expenses_abs,
-        'week_expenses': week_expenses_abs,
-        'weekly_limit': weekly_limit,
-        'monthly_limit': monthly_limit,
-        'weekly_spent': weekly_spent,
-        'monthly_spent': monthly_spent,
-        'weekly_percent': weekly_percent,
-        'monthly_percent': monthly_percent,
-        'weekly_left_days': weekly_left_days,
-        'monthly_left_days': monthly_left_days,
-        'savings_ratio': savings_ratio,
-        'goals': goals,
-        'currency_symbol': "\u20b1",
-    }
+        summary = empty_dashboard_summary()
+
+    return render(request, 'finance/dashboard.html', _dashboard_context(folders, summary))
+
+
+@etag_page
+async def adashboard(request):
+    # Async twin of `dashboard`, routed instead of it under ASGI (FINANCE_ASYNC_VIEWS).
+    # Templates read request.user; resolve it here so rendering never queries from the loop.
+    request.user = user = await request.auser()
+    if user.is_authenticated:
+        folders = Category.objects.filter(user=user)
+        summary = await aget_dashboard_summary(user)
+    else:
+        folders = Category.objects.none()
+        summary = empty_dashboard_summary()
 
-    return render(request, 'finance/dashboard.html', context)
+    return render(request, 'finance/dashboard.html', _dashboard_context(folders, summary))
 
 
 @login_required
@@ -190,20 +94,116 @@ def add_transaction(request):
     return render(request, "finance/add_transaction.html", {"form": form})
 
 
-@login_required
-def transaction_list(request):
-    transactions = (
-        Transaction.objects.filter(user=request.user)
-        .select_related("folder")
-        .order_by("-date")
-    )
-    context = {
-        "transactions": _build_transaction_items(transactions),
+def _page_context(request, rows, next_cursor, page_size):
+    return {
+        "transactions": rows,
+        "next_cursor": next_cursor,
+        "page_size": page_size if "page_size" in request.GET else "",
+        "is_first_page": not request.GET.get("cursor"),
+        "query": request.GET.get("q", "").strip(),
         "currency_symbol": "\u20b1",
     }
+
+
+def _transaction_page(request):
+    page_size = get_page_size(request)
+    query = request.GET.get("q", "").strip()
+    if query:
+        # Search results are one ranked page; relevance has no cursor to continue from.
+        return _page_context(request, search_transactions(request.user, query, page_size), None, page_size)
+    transactions = project_transaction_rows(Transaction.objects.filter(user=request.user))
+    rows, next_cursor = keyset_page(transactions, request.GET.get("cursor"), page_size)
+    return _page_context(request, rows, next_cursor, page_size)
+
+
+async def _atransaction_page(request):
+    request.user = await request.auser()
+    page_size = get_page_size(request)
+    query = request.GET.get("q", "").strip()
+    if query:
+        rows = await sync_to_async(search_transactions)(request.user, query, page_size)
+        return _page_context(request, rows, None, page_size)
+    transactions = project_transaction_rows(Transaction.objects.filter(user=request.user))
+    rows, next_cursor = await akeyset_page(transactions, request.GET.get("cursor"), page_size)
+    return _page_context(request, rows, next_cursor, page_size)
+
+
+@login_required
+def import_transactions(request):
+    # Imported on use: the statement parsers are not needed to boot a cold serverless instance.
+    from .importers import PARSERS, ImportFormatError, detect_format, import_statement
+
+    result = None
+    if request.method == "POST":
+        form = TransactionImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            statement = form.cleaned_data["statement"]
+            try:
+                file_format = form.cleaned_data["file_format"] or detect_format(statement.name)
+                result = import_statement(
+                    request.user,
+                    PARSERS[file_format](statement.file),
+                    default_folder=form.cleaned_data["default_folder"],
+                )
+            except ImportFormatError as error:
+                form.add_error("statement", str(error))
+    else:
+        form = TransactionImportForm()
+
+    return render(request, "finance/import_transactions.html", {"form": form, "result": result})
+
+
+@login_required
+def export_transactions(request):
+    from .exporters import CONTENT_TYPES, ENCODERS, export_filename, export_rows
+
+    form = TransactionExportForm(request.GET, user=request.user)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text())
+
+    file_format = form.cleaned_data["format"] or "csv"
+    rows = export_rows(
+        request.user,
+        start=form.cleaned_data["start"],
+        end=form.cleaned_data["end"],
+        folder=form.cleaned_data["folder"],
+    )
+    response = StreamingHttpResponse(
+        ENCODERS[file_format](rows), content_type=CONTENT_TYPES[file_format]
+    )
+    response["Content-Disposition"] = f'attachment; filename="{export_filename(file_format)}"'
+    return response
+
+
+@login_required
+@etag_page
+def transaction_list(request):
+    context = _transaction_page(request)
     return render(request, "finance/transactions_list.html", context)
 
 
+@login_required
+@etag_page
+def transaction_list_more(request):
+    # "Load more" fragment: the next page of rows plus its own pager.
+    context = _transaction_page(request)
+    return render(request, "finance/_transaction_rows.html", context)
+
+
+@login_required
+@etag_page
+async def atransaction_list(request):
+    context = await _atransaction_page(request)
+    return render(request, "finance/transactions_list.html", context)
+
+
+@login_required
+@etag_page
+async def atransaction_list_more(request):
+    context = await _atransaction_page(request)
+    return render(request, "finance/_transaction_rows.html", context)
+
+
 @login_required
 def edit_limits(request):
     budget, _ = BudgetLimit.objects.get_or_create(user=request.user)
@@ -240,17 +240,34 @@ def update_goal(request, goal_id):
         return redirect("dashboard")
 
     if request.method == "POST":
-        form = PurchaseGoalUpdateForm(request.POST, instance=goal)
+        form = GoalContributionForm(request.POST, goal=goal)
         if form.is_valid():
-            form.save()
-            return redirect("dashboard")
+            status = form.cleaned_data["status"]
+            if status != goal.status:
+                goal.status = status
+                goal.save(update_fields=["status", "updated_at"])
+            amount = form.cleaned_data["amount"]
+            try:
+                if amount:
+                    # An F() increment, so concurrent contributions from other tabs are kept.
+                    contribute(goal, amount, form.cleaned_data["transaction"], form.cleaned_data["note"])
+            except IntegrityError:
+                # Another tab linked the same transaction between validation and save.
+                form.add_error("transaction", "That transaction is already linked to a goal.")
+            else:
+                return redirect("dashboard")
     else:
-        form = PurchaseGoalUpdateForm(instance=goal)
+        form = GoalContributionForm(goal=goal)
 
     return render(
         request,
         "finance/update_goal.html",
-        {"form": form, "goal": goal},
+        {
+            "form": form,
+            "goal": goal,
+            "contributions": get_contribution_history(goal),
+            "currency_symbol": "\u20b1",
+        },
     )
 
 
@@ -266,10 +283,7 @@ def delete_goal(request, goal_id):
 
 @login_required
 def edit_profile(request):
-    profile, _ = UserProfile.objects.get_or_create(
-        user=request.user,
-        defaults={"full_name": request.user.get_full_name() or request.user.username},
-    )
+    profile = get_or_create_profile(request.user)
     if request.method == "POST":
         form = ProfileForm(request.POST, request.FILES, instance=profile)
         if form.is_valid():
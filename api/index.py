@@ -8,7 +8,8 @@ ROOT = Path(__file__).resolve().parent.parent
 PROJECT_ROOT = ROOT / "Cadee"
 sys.path.insert(0, str(PROJECT_ROOT))
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cadee_core.settings")
+# Lean profile: no admin, WhiteNoise or messages on the cold-start path (see settings_serverless).
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cadee_core.settings_serverless")
 
 application = get_wsgi_application()
 app = application